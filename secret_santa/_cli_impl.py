@@ -0,0 +1,610 @@
+"""Implementation of the Secret Santa CLI commands.
+
+The click declarations live in ``cli.py`` and the ``_commands`` package; their
+bodies live here so that the Rich, pydantic and storage imports are paid only
+when a command actually runs.
+"""
+
+import click
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+from rich.text import Text
+from rich import box
+
+from .models import Participant, Cluster, validate_email
+from .storage import Storage
+
+console = Console()
+storage = Storage()
+
+# ASCII Santa Art (cleaner version)
+SANTA_ART = """
+[white]        *    *  *[/]
+[white]     *         *[/]
+[red]        ███████[/]
+[white]       █████████[/]
+[red]      ███████████[/]
+[white]     █[/][red]██[/][white]█████[/][red]██[/][white]█[/]
+[white]     █[/][blue]◉[/][white]█████[/][blue]◉[/][white]█[/]
+[white]      █████████[/]
+[white]       ██[/][red]███[/][white]██[/]
+[red]      ▄█████████▄[/]
+[red]     ███████████[/][white]█[/][red]█[/]
+[white]    ═══════════════[/]
+"""
+
+TITLE_ART = """
+[red]╔═══════════════════════════════════════════════════════════════════════════╗[/]
+[red]║[/]                                                                           [red]║[/]
+[red]║[/]    [white]███████╗███████╗ ██████╗██████╗ ███████╗████████╗[/]                    [red]║[/]
+[red]║[/]    [white]██╔════╝██╔════╝██╔════╝██╔══██╗██╔════╝╚══██╔══╝[/]                    [red]║[/]
+[red]║[/]    [white]███████╗█████╗  ██║     ██████╔╝█████╗     ██║[/]                       [red]║[/]
+[red]║[/]    [white]╚════██║██╔══╝  ██║     ██╔══██╗██╔══╝     ██║[/]                       [red]║[/]
+[red]║[/]    [white]███████║███████╗╚██████╗██║  ██║███████╗   ██║[/]                       [red]║[/]
+[red]║[/]    [white]╚══════╝╚══════╝ ╚═════╝╚═╝  ╚═╝╚══════╝   ╚═╝[/]                       [red]║[/]
+[red]║[/]                                                                           [red]║[/]
+[red]║[/]         [red]███████╗ █████╗ ███╗   ██╗████████╗ █████╗[/]                       [red]║[/]
+[red]║[/]         [red]██╔════╝██╔══██╗████╗  ██║╚══██╔══╝██╔══██╗[/]                      [red]║[/]
+[red]║[/]         [red]███████╗███████║██╔██╗ ██║   ██║   ███████║[/]                      [red]║[/]
+[red]║[/]         [red]╚════██║██╔══██║██║╚██╗██║   ██║   ██╔══██║[/]                      [red]║[/]
+[red]║[/]         [red]███████║██║  ██║██║ ╚████║   ██║   ██║  ██║[/]                      [red]║[/]
+[red]║[/]         [red]╚══════╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚═╝  ╚═╝[/]                      [red]║[/]
+[red]║[/]                                                                           [red]║[/]
+[red]╚═══════════════════════════════════════════════════════════════════════════╝[/]
+"""
+
+# (title, santa) parsed into Text on first use so the markup is only tokenized once
+_ART_CACHE = None
+
+
+def _get_art():
+    """Return the title and Santa art as pre-parsed Text objects."""
+    global _ART_CACHE
+    if _ART_CACHE is None:
+        _ART_CACHE = (Text.from_markup(TITLE_ART), Text.from_markup(SANTA_ART))
+    return _ART_CACHE
+
+
+_COMMANDS_TEXT = """[bold white]👤 PEOPLE[/]
+  [cyan]santa add[/] [dim]"Name" "email"[/]          Add a person
+  [cyan]santa add[/] [dim]... --kid[/]               Add a kid (parent's email, use --separate-kids)
+  [cyan]santa add[/] [dim]... --cluster "Family"[/]  Add and assign to cluster in one step
+  [cyan]santa bulk-add[/] [dim]people.csv[/]         Add everyone from a CSV file
+  [cyan]santa list[/]                        View all participants
+  [cyan]santa remove[/] [dim]"Name"[/]               Remove someone
+
+[bold white]👨‍👩‍👧‍👦 FAMILY GROUPS[/] (prevent matching within group)
+  [cyan]santa clusters[/]                    Quick view all groups
+  [cyan]santa cluster create[/] [dim]"Family"[/]     Create a group
+  [cyan]santa cluster add[/] [dim]"Family" "Name"[/]  Add person to group
+  [cyan]santa cluster kick[/] [dim]"Family" "Name"[/] Remove from group
+  [cyan]santa cluster remove[/] [dim]"Family"[/]     Delete entire group
+
+[bold white]🎁 MATCHING & SENDING[/]
+  [cyan]santa assign[/]                       Generate random matches
+  [cyan]santa assign --separate-kids[/]       Kids match kids only
+  [cyan]santa send --dry-run[/]               Preview emails
+  [cyan]santa send[/]                         Send all emails
+
+[bold white]⚙️ OTHER[/]
+  [cyan]santa config --show[/]                View email settings
+  [cyan]santa clear[/]                        Delete all data
+  [cyan]santa --help[/]                       Full command reference"""
+
+# Quick Reference panel, built on first use and reused afterwards
+_COMMANDS_PANEL = None
+
+
+def _get_commands_panel():
+    """Return the Quick Reference panel shown on the welcome screen."""
+    global _COMMANDS_PANEL
+    if _COMMANDS_PANEL is None:
+        _COMMANDS_PANEL = Panel(
+            _COMMANDS_TEXT,
+            title="[bold red]🎄 Quick Reference 🎄[/]",
+            border_style="red",
+            box=box.DOUBLE
+        )
+    return _COMMANDS_PANEL
+
+
+def show_welcome():
+    """Display the welcome screen with Santa art and navigation."""
+    from rich.console import Group
+    
+    if console.is_terminal:
+        from rich.align import Align
+
+        title_art, santa_art = _get_art()
+        console.clear()
+        renderables = [title_art, "", Align.center(santa_art)]
+    else:
+        # Piped or captured output: no screen clear escape codes or ASCII art
+        renderables = ["🎅 Secret Santa CLI"]
+    
+    # Status dashboard and categorized commands, all rendered in a single pass
+    renderables += [build_dashboard(), "", _get_commands_panel()]
+    console.print(Group(*renderables))
+
+
+# Constant dashboard labels and status badges, built once instead of re-parsing markup per call
+_LABEL_PARTICIPANTS = Text("👥 Participants\n", style="white")
+_LABEL_CLUSTERS = Text("👨‍👩‍👧‍👦 Clusters\n", style="white")
+_LABEL_ASSIGNMENTS = Text("🎁 Assignments\n", style="white")
+_LABEL_EMAIL = Text("📧 Email\n", style="white")
+_STATUS_ZERO_WARN = Text("0", style="yellow")
+_STATUS_ZERO_DIM = Text("0", style="dim")
+_STATUS_DONE = Text("✓ Done", style="green")
+_STATUS_PENDING = Text("Pending", style="yellow")
+_STATUS_READY = Text("✓ Ready", style="green")
+_STATUS_NOT_CONFIGURED = Text("✗ Not configured", style="red")
+
+
+def build_dashboard() -> Panel:
+    """Build the status panel for participants, clusters, assignments and email."""
+    participants = storage.list_participants()
+    clusters = storage.list_clusters()
+    assignments = storage.get_assignments()
+    config = storage.get_config()
+    
+    # Status indicators
+    p_status = Text(f"✓ {len(participants)}", style="green") if participants else _STATUS_ZERO_WARN
+    c_status = Text(f"✓ {len(clusters)}", style="green") if clusters else _STATUS_ZERO_DIM
+    a_status = _STATUS_DONE if assignments else _STATUS_PENDING
+    e_status = _STATUS_READY if config.brevo_api_key else _STATUS_NOT_CONFIGURED
+    
+    dashboard = Table(show_header=False, box=box.SIMPLE, padding=(0, 2))
+    dashboard.add_column(justify="center")
+    dashboard.add_column(justify="center")
+    dashboard.add_column(justify="center")
+    dashboard.add_column(justify="center")
+    
+    dashboard.add_row(
+        Text.assemble(_LABEL_PARTICIPANTS, p_status),
+        Text.assemble(_LABEL_CLUSTERS, c_status),
+        Text.assemble(_LABEL_ASSIGNMENTS, a_status),
+        Text.assemble(_LABEL_EMAIL, e_status),
+    )
+    
+    return Panel(dashboard, title="[bold white]Status Dashboard[/]", border_style="white")
+
+
+def _print_plain(rows):
+    """Print rows as tab-separated lines, skipping Rich layout for non-terminal output."""
+    print("\n".join("\t".join(row) for row in rows))
+
+
+# ============================================================================
+# Participant Commands
+# ============================================================================
+
+def _add_one(name: str, email: str, parent_email: str = None, kid: bool = False, cluster_name: str = None):
+    """Add a participant (and optional cluster membership), printing progress.
+
+    Raises ValueError if the participant is invalid or already exists.
+    """
+    if not name.strip():
+        raise ValueError("name is required")
+    participant = Participant(
+        name=name,
+        email=validate_email(email),
+        parent_email=validate_email(parent_email) if parent_email else None,
+        is_kid=kid
+    )
+    storage.add_participant(participant)
+    
+    msg = f"✅ Added [bold green]{name}[/] ({email})"
+    if kid:
+        msg += " [magenta][KID][/]"
+    if parent_email:
+        msg += f" with parent CC: {parent_email}"
+    console.print(msg)
+    
+    # Handle --cluster option: create cluster if needed, then add participant
+    if cluster_name:
+        existing_cluster = storage.get_cluster_by_name(cluster_name)
+        if not existing_cluster:
+            cluster = Cluster(name=cluster_name)
+            storage.create_cluster(cluster)
+            console.print(f"✅ Created new cluster [bold blue]{cluster_name}[/]")
+        
+        storage.add_to_cluster(cluster_name, name)
+        console.print(f"✅ Added to cluster [bold blue]{cluster_name}[/]")
+
+
+def add_participant(name: str, email: str, parent_email: str = None, kid: bool = False, cluster_name: str = None):
+    """Add a NEW participant (person) to the exchange."""
+    try:
+        # Adding, creating the cluster and joining it land in one write
+        with storage.transaction():
+            _add_one(name, email, parent_email, kid, cluster_name)
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+
+
+_TRUE_VALUES = {"1", "true", "yes", "y", "x", "✓"}
+
+
+def bulk_add(csvfile):
+    """Add every participant listed in a CSV file, saving once at the end."""
+    import csv
+    
+    reader = csv.DictReader(csvfile)
+    missing = {"name", "email"} - set(reader.fieldnames or [])
+    if missing:
+        raise click.ClickException(f"CSV is missing required column(s): {', '.join(sorted(missing))}")
+    
+    added = 0
+    with storage.transaction():
+        # Row 1 is the header, so data starts on line 2
+        for line_no, row in enumerate(reader, 2):
+            try:
+                _add_one(
+                    name=(row.get("name") or "").strip(),
+                    email=(row.get("email") or "").strip(),
+                    parent_email=(row.get("parent_email") or "").strip() or None,
+                    kid=(row.get("kid") or "").strip().lower() in _TRUE_VALUES,
+                    cluster_name=(row.get("cluster") or "").strip() or None,
+                )
+                added += 1
+            except ValueError as e:
+                console.print(f"[yellow]Skipped line {line_no}:[/] {e}")
+    
+    console.print(f"\n[bold green]Done![/] Added {added} participant(s).")
+
+
+def list_participants():
+    """Show all participants."""
+    participants = storage.list_participants()
+    
+    if not participants:
+        console.print("[yellow]No participants yet.[/] Add some with: santa add \"name\" \"email\"")
+        return
+    
+    clusters = {c.id: c.name for c in storage.list_clusters()}
+    
+    rows = [
+        (
+            str(i),
+            p.name,
+            p.email,
+            "✓" if p.is_kid else "-",
+            p.parent_email or "-",
+            clusters.get(p.cluster_id, "-") if p.cluster_id else "-",
+        )
+        for i, p in enumerate(participants, 1)
+    ]
+    
+    # Piped output (santa list | grep ...) gets plain tab-separated lines
+    if not console.is_terminal:
+        _print_plain(rows)
+        return
+    
+    table = Table(title="🎅 Participants", show_header=True, header_style="bold magenta")
+    table.add_column("#", style="dim", width=4)
+    table.add_column("Name", style="cyan")
+    table.add_column("Email", style="green")
+    table.add_column("Kid", style="magenta", justify="center")
+    table.add_column("Parent Email", style="yellow")
+    table.add_column("Cluster", style="blue")
+    
+    for row in rows:
+        table.add_row(*row)
+    
+    console.print(table)
+
+
+def remove_participant(name: str):
+    """Remove a participant from the exchange."""
+    if storage.remove_participant(name):
+        console.print(f"✅ Removed [bold red]{name}[/]")
+    else:
+        raise click.ClickException(f"Participant '{name}' not found")
+
+
+# ============================================================================
+# Cluster Commands
+# ============================================================================
+
+def create_cluster(name: str):
+    """Create a new exclusion cluster (e.g. 'Smith Family')."""
+    try:
+        cluster = Cluster(name=name)
+        storage.create_cluster(cluster)
+        console.print(f"✅ Created cluster [bold blue]{name}[/]")
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+
+
+def add_to_cluster(cluster_name: str, participant_name: str):
+    """Add an EXISTING participant to a cluster."""
+    try:
+        storage.add_to_cluster(cluster_name, participant_name)
+        console.print(f"✅ Added [bold cyan]{participant_name}[/] to cluster [bold blue]{cluster_name}[/]")
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+
+
+def display_clusters():
+    """Show all clusters and their members."""
+    clusters = storage.list_clusters()
+    
+    if not clusters:
+        console.print("[yellow]No clusters yet.[/] Create one with: santa cluster create \"Family Name\"")
+        return
+    
+    participants_by_id = storage.participants_by_id()
+    plain = not console.is_terminal
+    rows = []
+    for cluster in clusters:
+        members = [
+            participants_by_id[member_id].name
+            for member_id in cluster.member_ids
+            if member_id in participants_by_id
+        ]
+        
+        if plain:
+            rows.append((cluster.name, str(len(members)), ", ".join(members) or "-"))
+            continue
+        
+        member_text = ", ".join(members) if members else "[dim]No members yet - use: santa cluster add \"" + cluster.name + "\" \"Name\"[/]"
+        
+        panel = Panel(
+            member_text,
+            title=f"[bold blue]{cluster.name}[/]",
+            subtitle=f"{len(members)} members",
+            border_style="blue"
+        )
+        console.print(panel)
+    
+    if plain:
+        _print_plain(rows)
+
+
+def remove_cluster(cluster_name: str):
+    """Delete an entire cluster (members stay in the exchange)."""
+    if storage.remove_cluster(cluster_name):
+        console.print(f"✅ Removed cluster [bold red]{cluster_name}[/]")
+    else:
+        raise click.ClickException(f"Cluster '{cluster_name}' not found")
+
+
+def remove_from_cluster(cluster_name: str, participant_name: str):
+    """Remove a person from a cluster (they stay in the exchange)."""
+    try:
+        storage.remove_from_cluster(cluster_name, participant_name)
+        console.print(f"✅ Removed [bold cyan]{participant_name}[/] from cluster [bold blue]{cluster_name}[/]")
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+
+
+# ============================================================================
+# Assignment Commands
+# ============================================================================
+
+# Below this many participants matching finishes before a spinner could even render
+_SPINNER_MIN_PARTICIPANTS = 50
+
+# Above this many assignments, rows are printed as they go instead of laying
+# out the whole table before anything appears
+_TABLE_MAX_ROWS = 200
+
+
+def assign(force: bool, separate_kids: bool):
+    """Generate random Secret Santa assignments."""
+    from .matcher import create_assignments, MatcherError
+
+    existing = storage.get_assignments()
+    
+    if existing and not force:
+        console.print("[yellow]Assignments already exist![/] Use --force to regenerate.")
+        console.print("⚠️  This will overwrite current assignments.")
+        return
+    
+    try:
+        mode_msg = "[magenta]Kids match kids only[/]" if separate_kids else "[cyan]Random matching[/]"
+        # Matching a typical party is instant; only animate a spinner for big groups
+        if len(storage.list_participants()) < _SPINNER_MIN_PARTICIPANTS:
+            assignments = create_assignments(storage, separate_kids=separate_kids)
+        else:
+            with console.status(f"[bold green]Generating assignments... ({mode_msg})"):
+                assignments = create_assignments(storage, separate_kids=separate_kids)
+        
+        storage.save_assignments(assignments)
+        
+        console.print(f"\n[bold green]🎉 Assignments generated![/] ({mode_msg})\n")
+        
+        # Show masked table - operator cannot see who matches with whom
+        if console.is_terminal and len(assignments) <= _TABLE_MAX_ROWS:
+            table = Table(show_header=True, header_style="bold magenta")
+            table.add_column("✓", justify="center", style="green", width=3)
+            table.add_column("Participant", style="cyan")
+            table.add_column("Verification Code", style="yellow", justify="center")
+            
+            for a in assignments:
+                table.add_row("✓", a.giver_name, f"[bold]{a.verification_code}[/]")
+            
+            console.print(table)
+        elif console.is_terminal:
+            for a in assignments:
+                console.print(f"  [green]✓[/] [cyan]{a.giver_name}[/]  [bold yellow]{a.verification_code}[/]")
+        else:
+            _print_plain([(a.giver_name, a.verification_code) for a in assignments])
+        console.print("\n[dim]🔒 Recipient names are hidden to protect the secret![/]")
+        console.print("[dim]Each participant will receive an email with their match and verification code.[/]")
+        
+        # Show gift limit reminder
+        config = storage.get_config()
+        console.print(f"\n[bold yellow]💰 Gift Limit: ${config.gift_limit}[/]")
+        console.print("\n[dim]Run 'santa send' to email everyone their assignments.[/]")
+        
+    except MatcherError as e:
+        raise click.ClickException(str(e)) from e
+
+
+# Persist sent flags after this many successful sends, so an interrupted
+# run can be resumed without re-sending emails that already went out
+_MARK_SENT_EVERY = 10
+
+
+def send(dry_run: bool, workers: int = 8):
+    """Send assignment emails to all participants."""
+    from .email import send_all_assignments, EmailError
+
+    assignments = storage.get_assignments()
+    config = storage.get_config()
+    
+    if not assignments:
+        console.print("[yellow]No assignments yet.[/] Run 'santa assign' first.")
+        return
+    
+    if not config.brevo_api_key and not dry_run:
+        console.print("[red]Error:[/] Email not configured. Run: santa config")
+        return
+    
+    if dry_run:
+        console.print("[bold yellow]🔍 DRY RUN MODE[/] - No emails will be sent\n")
+    
+    unsaved_sent = []
+    
+    def flush_sent():
+        storage.mark_emails_sent(unsaved_sent)
+        unsaved_sent.clear()
+    
+    def on_progress(assignment, result):
+        status = result.get("status", "unknown")
+        if status == "sent":
+            unsaved_sent.append(assignment.giver_id)
+            if len(unsaved_sent) >= _MARK_SENT_EVERY:
+                flush_sent()
+            console.print(f"  ✅ Sent to {assignment.giver_name} ({assignment.giver_email})")
+        elif status == "would_send":
+            console.print(f"  📧 Would send to {assignment.giver_name} ({assignment.giver_email})")
+        elif status == "already_sent":
+            console.print(f"  ⏭️  Already sent to {assignment.giver_name}")
+        else:
+            console.print(f"  ❌ Failed: {assignment.giver_name} - {result.get('error', 'Unknown error')}")
+    
+    console.print("[bold]Sending emails...[/]\n")
+    
+    try:
+        results = send_all_assignments(
+            assignments,
+            config,
+            dry_run=dry_run,
+            on_progress=on_progress,
+            workers=workers
+        )
+        
+        sent = sum(1 for r in results if r.get("status") in ("sent", "would_send"))
+        console.print(f"\n[bold green]Done![/] {sent}/{len(assignments)} emails {'would be sent' if dry_run else 'sent'}.")
+        
+    except EmailError as e:
+        raise click.ClickException(str(e)) from e
+    finally:
+        # Save whatever was sent, even if the run was interrupted
+        flush_sent()
+
+
+def lookup_assignment(name: str):
+    """[ADMIN] Look up who a specific person is assigned to buy for."""
+    assignments = storage.get_assignments()
+    
+    if not assignments:
+        console.print("[yellow]No assignments yet.[/] Run 'santa assign' first.")
+        return
+    
+    # Search for the person (case-insensitive)
+    name_lower = name.lower()
+    found = None
+    
+    for a in assignments:
+        if a.giver_name.lower() == name_lower:
+            found = a
+            break
+    
+    if not found:
+        console.print(f"[red]Error:[/] No assignment found for '{name}'")
+        console.print("[dim]Make sure the name matches exactly (case-insensitive).[/]")
+        return
+    
+    # Display the assignment
+    console.print()
+    console.print(Panel(
+        f"[bold cyan]{found.giver_name}[/] → [bold green]{found.receiver_name}[/]\n\n"
+        f"[dim]Verification Code:[/] [bold yellow]{found.verification_code}[/]\n"
+        f"[dim]Email sent:[/] {'✅ Yes' if found.email_sent else '❌ No'}",
+        title="🔓 [bold red]SECRET REVEALED[/] 🔓",
+        border_style="red"
+    ))
+    console.print()
+
+
+# ============================================================================
+# Config Command
+# ============================================================================
+
+def config_cmd(api_key: str, sender_email: str, sender_name: str, show: bool, create_templates: bool = False):
+    """Configure email settings for Secret Santa notifications."""
+    current = storage.get_config()
+    
+    if show:
+        console.print("\n[bold]Current Configuration:[/]\n")
+        console.print(f"  API Key:      {'*' * 20 if current.brevo_api_key else '[red]Not set[/]'}")
+        console.print(f"  Sender Email: {current.sender_email or '[red]Not set[/]'}")
+        console.print(f"  Sender Name:  {current.sender_name}")
+        templates = f"#{current.template_id} / #{current.kid_template_id}" if current.template_id else "[dim]Not created[/]"
+        console.print(f"  Templates:    {templates}")
+        console.print("\nGet your free Brevo API key at: [link=https://www.brevo.com/]https://www.brevo.com/[/]")
+        return
+    
+    if not any([api_key, sender_email, sender_name, create_templates]):
+        console.print("Use --api-key, --sender-email, or --sender-name to configure.")
+        console.print("Use --show to view current configuration.")
+        return
+    
+    if sender_email:
+        try:
+            sender_email = validate_email(sender_email)
+        except ValueError as e:
+            raise click.ClickException(str(e)) from e
+    
+    if api_key:
+        current.brevo_api_key = api_key
+        console.print("✅ API key saved")
+    
+    if sender_email:
+        current.sender_email = sender_email
+        console.print(f"✅ Sender email set to: {sender_email}")
+    
+    if sender_name:
+        current.sender_name = sender_name
+        console.print(f"✅ Sender name set to: {sender_name}")
+    
+    if create_templates:
+        from .email import create_templates as upload_templates, EmailError
+        
+        try:
+            current.template_id, current.kid_template_id = upload_templates(current)
+        except EmailError as e:
+            storage.save_config(current)
+            raise click.ClickException(str(e)) from e
+        console.print(f"✅ Email templates created (#{current.template_id}, #{current.kid_template_id})")
+    
+    storage.save_config(current)
+
+
+def export_data(output: str):
+    """Write all data to a file as indented, human-readable JSON."""
+    storage.export_pretty(output)
+    console.print(f"✅ Data exported to [bold]{output}[/]")
+
+
+def clear_all():
+    """Clear all participants, clusters, and assignments."""
+    import shutil
+    data_dir = storage.data_dir
+    if data_dir.exists():
+        shutil.rmtree(data_dir)
+    console.print("✅ All data cleared!")
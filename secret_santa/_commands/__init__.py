@@ -0,0 +1 @@
+"""Subcommand declarations, imported on demand by ``cli.LazyGroup``."""
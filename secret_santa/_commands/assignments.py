@@ -0,0 +1,36 @@
+"""Assignment commands: assign, send and lookup."""
+
+import click
+
+
+@click.command("assign")
+@click.option("--force", "-f", is_flag=True, help="Overwrite existing assignments")
+@click.option("--separate-kids", "-s", is_flag=True, help="Kids only match with other kids (default: random)")
+def assign(force: bool, separate_kids: bool):
+    """Generate random Secret Santa assignments."""
+    from .._cli_impl import assign as _impl
+    _impl(force, separate_kids)
+
+
+@click.command("send")
+@click.option("--dry-run", "-n", is_flag=True, help="Preview emails without sending")
+@click.option("--workers", "-w", default=8, show_default=True, type=click.IntRange(min=1),
+              help="Number of emails to send concurrently")
+def send(dry_run: bool, workers: int):
+    """Send assignment emails to all participants."""
+    from .._cli_impl import send as _impl
+    _impl(dry_run, workers)
+
+
+@click.command("lookup")
+@click.argument("name")
+@click.confirmation_option(prompt="⚠️  This will reveal a secret assignment! Are you sure?")
+def lookup_assignment(name: str):
+    """[ADMIN] Look up who a specific person is assigned to buy for.
+    
+    This reveals the secret assignment - use only if absolutely necessary!
+    
+    Example: santa lookup "Alice"
+    """
+    from .._cli_impl import lookup_assignment as _impl
+    _impl(name)
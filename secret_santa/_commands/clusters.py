@@ -0,0 +1,75 @@
+"""Cluster commands: the 'cluster' group and the 'clusters' shortcut."""
+
+import click
+
+
+@click.group("cluster")
+def cluster_group():
+    """Manage exclusion clusters (family groups who shouldn't match).
+    
+    Use 'cluster create' to make a group, then 'cluster add' to put people in it.
+    """
+    pass
+
+
+@cluster_group.command("create")
+@click.argument("name")
+def create_cluster(name: str):
+    """Create a new exclusion cluster (e.g. 'Smith Family').
+    
+    Example: santa cluster create "Smith Family"
+    """
+    from .._cli_impl import create_cluster as _impl
+    _impl(name)
+
+
+@cluster_group.command("add")
+@click.argument("cluster_name")
+@click.argument("participant_name")
+def add_to_cluster(cluster_name: str, participant_name: str):
+    """Add an EXISTING participant to a cluster.
+    
+    Note: The person must already exist (use 'santa add' first).
+    
+    Example: santa cluster add "Smith Family" "John"
+    """
+    from .._cli_impl import add_to_cluster as _impl
+    _impl(cluster_name, participant_name)
+
+
+@cluster_group.command("list")
+def list_clusters():
+    """Show all clusters and their members."""
+    from .._cli_impl import display_clusters as _impl
+    _impl()
+
+
+@click.command("clusters")
+def quick_list_clusters():
+    """Quick shortcut to view all clusters (same as 'santa cluster list')."""
+    from .._cli_impl import display_clusters as _impl
+    _impl()
+
+
+@cluster_group.command("remove")
+@click.argument("cluster_name")
+@click.confirmation_option(prompt="Are you sure you want to delete this cluster?")
+def remove_cluster(cluster_name: str):
+    """Delete an entire cluster (members stay in the exchange).
+    
+    Example: santa cluster remove "Smith Family"
+    """
+    from .._cli_impl import remove_cluster as _impl
+    _impl(cluster_name)
+
+
+@cluster_group.command("kick")
+@click.argument("cluster_name")
+@click.argument("participant_name")
+def remove_from_cluster(cluster_name: str, participant_name: str):
+    """Remove a person from a cluster (they stay in the exchange).
+    
+    Example: santa cluster kick "Smith Family" "John"
+    """
+    from .._cli_impl import remove_from_cluster as _impl
+    _impl(cluster_name, participant_name)
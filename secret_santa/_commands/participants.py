@@ -0,0 +1,51 @@
+"""Participant commands: add, bulk-add, list and remove."""
+
+import click
+
+
+@click.command("add")
+@click.argument("name")
+@click.argument("email")
+@click.option("--parent-email", "-p", help="Parent email to CC on assignment notification")
+@click.option("--kid", "-k", is_flag=True, help="Mark as kid (email goes to parent, shows child's assignment)")
+@click.option("--cluster", "-c", "cluster_name", help="Add to cluster (creates if needed)")
+def add_participant(name: str, email: str, parent_email: str = None, kid: bool = False, cluster_name: str = None):
+    """Add a NEW participant (person) to the exchange.
+    
+    Examples:
+        santa add "John" "john@email.com"
+        santa add "Tommy" "parent@email.com" --kid
+        santa add "Alice" "alice@email.com" --cluster "Smith Family"
+    """
+    from .._cli_impl import add_participant as _impl
+    _impl(name, email, parent_email, kid, cluster_name)
+
+
+@click.command("bulk-add")
+@click.argument("csvfile", type=click.File("r", encoding="utf-8"))
+def bulk_add(csvfile):
+    """Add many participants at once from a CSV file.
+    
+    The CSV needs a header row with 'name' and 'email' columns, plus optional
+    'parent_email', 'kid' (yes/true/1) and 'cluster' columns. Use - for stdin.
+    
+    Example: santa bulk-add family.csv
+    """
+    from .._cli_impl import bulk_add as _impl
+    _impl(csvfile)
+
+
+@click.command("list")
+def list_participants():
+    """Show all participants."""
+    from .._cli_impl import list_participants as _impl
+    _impl()
+
+
+@click.command("remove")
+@click.argument("name")
+@click.confirmation_option(prompt="Are you sure you want to remove this participant?")
+def remove_participant(name: str):
+    """Remove a participant from the exchange."""
+    from .._cli_impl import remove_participant as _impl
+    _impl(name)
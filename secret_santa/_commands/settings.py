@@ -0,0 +1,31 @@
+"""Settings commands: config, export and clear."""
+
+import click
+
+
+@click.command("config")
+@click.option("--api-key", "-k", help="Brevo API key")
+@click.option("--sender-email", "-e", help="Sender email address")
+@click.option("--sender-name", "-n", help="Sender display name")
+@click.option("--show", "-s", is_flag=True, help="Show current config")
+@click.option("--create-templates", is_flag=True, help="Upload email templates to Brevo and send with them")
+def config_cmd(api_key: str, sender_email: str, sender_name: str, show: bool, create_templates: bool):
+    """Configure email settings for Secret Santa notifications."""
+    from .._cli_impl import config_cmd as _impl
+    _impl(api_key, sender_email, sender_name, show, create_templates)
+
+
+@click.command("export")
+@click.argument("output", type=click.Path(dir_okay=False, writable=True))
+def export_data(output: str):
+    """Write all data to OUTPUT as indented, human-readable JSON."""
+    from .._cli_impl import export_data as _impl
+    _impl(output)
+
+
+@click.command("clear")
+@click.confirmation_option(prompt="Are you sure you want to clear ALL data?")
+def clear_all():
+    """Clear all participants, clusters, and assignments."""
+    from .._cli_impl import clear_all as _impl
+    _impl()
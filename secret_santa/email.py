@@ -1,5 +1,10 @@
 """Email sending via Brevo (SendinBlue) API."""
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+import re
+import threading
+import time
 from typing import Optional
 import sib_api_v3_sdk
 from sib_api_v3_sdk.rest import ApiException
@@ -12,96 +17,159 @@ class EmailError(Exception):
     pass
 
 
-def create_email_html(receiver_name: str, gift_limit: int = 25, verification_code: str = "") -> str:
-    """Create festive HTML email content."""
-    return f"""
+# Default cap on Brevo API calls per second across all send workers
+DEFAULT_RATE_LIMIT = 2.0
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting how often API calls are made.
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    each acquire() takes one token, sleeping until one is available.
+    """
+    
+    __slots__ = ("rate", "capacity", "_tokens", "_clock", "_sleep", "_updated", "_lock")
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+_FIELD = re.compile(r"\$\{(\w+)\}")
+
+
+def _split_template(text: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    Split a template into its literal chunks and the ${field} names between them.
+    
+    ``$$`` in the template is a literal dollar sign.
+    """
+    parts = _FIELD.split(text)
+    chunks = tuple(part.replace("$$", "$") for part in parts[0::2])
+    return chunks, tuple(parts[1::2])
+
+
+def _fill(template: tuple[tuple[str, ...], tuple[str, ...]], **fields) -> str:
+    """Join a split template's chunks with the given field values."""
+    chunks, names = template
+    out = [chunks[0]]
+    for name, chunk in zip(names, chunks[1:]):
+        out.append(str(fields[name]))
+        out.append(chunk)
+    return "".join(out)
+
+
+# Email templates are split once at import; each call only joins the
+# invariant chunks around the per-recipient fields
+_EMAIL_TEMPLATE = _split_template("""
 <!DOCTYPE html>
 <html>
 <head>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, #1a472a 0%, #2d5a3f 100%);
             margin: 0;
             padding: 40px 20px;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 500px;
             margin: 0 auto;
             background: #fff;
             border-radius: 16px;
             padding: 40px;
             box-shadow: 0 10px 40px rgba(0,0,0,0.3);
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             margin-bottom: 30px;
-        }}
-        .snowflakes {{
+        }
+        .snowflakes {
             font-size: 40px;
             letter-spacing: 10px;
-        }}
-        h1 {{
+        }
+        h1 {
             color: #c41e3a;
             margin: 20px 0 10px;
             font-size: 28px;
-        }}
-        .gift-box {{
+        }
+        .gift-box {
             background: linear-gradient(135deg, #c41e3a 0%, #8b0000 100%);
             color: white;
             padding: 30px;
             border-radius: 12px;
             text-align: center;
             margin: 30px 0;
-        }}
-        .gift-box .label {{
+        }
+        .gift-box .label {
             font-size: 14px;
             opacity: 0.9;
             margin-bottom: 10px;
-        }}
-        .gift-box .name {{
+        }
+        .gift-box .name {
             font-size: 32px;
             font-weight: bold;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-        .info-box {{
+        }
+        .info-box {
             background: #f8f9fa;
             border: 2px solid #28a745;
             padding: 20px;
             border-radius: 12px;
             text-align: center;
             margin: 20px 0;
-        }}
-        .info-box .limit {{
+        }
+        .info-box .limit {
             font-size: 24px;
             font-weight: bold;
             color: #28a745;
-        }}
-        .verification {{
+        }
+        .verification {
             background: #fff3cd;
             border: 2px solid #ffc107;
             padding: 15px;
             border-radius: 8px;
             text-align: center;
             margin: 20px 0;
-        }}
-        .verification .code {{
+        }
+        .verification .code {
             font-size: 28px;
             font-weight: bold;
             font-family: monospace;
             color: #856404;
             letter-spacing: 4px;
-        }}
-        .footer {{
+        }
+        .footer {
             text-align: center;
             color: #666;
             font-size: 14px;
             margin-top: 30px;
-        }}
-        .tree {{
+        }
+        .tree {
             font-size: 50px;
             text-align: center;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -114,17 +182,17 @@ def create_email_html(receiver_name: str, gift_limit: int = 25, verification_cod
         
         <div class="gift-box">
             <div class="label">You are buying a gift for:</div>
-            <div class="name">🎁 {receiver_name} 🎁</div>
+            <div class="name">🎁 ${receiver_name} 🎁</div>
         </div>
         
         <div class="info-box">
             <div>💰 Gift Limit</div>
-            <div class="limit">${gift_limit}</div>
+            <div class="limit">$$${gift_limit}</div>
         </div>
         
         <div class="verification">
             <div>🔐 Your Verification Code</div>
-            <div class="code">{verification_code}</div>
+            <div class="code">${verification_code}</div>
             <div style="font-size: 12px; color: #666; margin-top: 10px;">Use this code to verify your assignment is correct</div>
         </div>
         
@@ -136,114 +204,120 @@ def create_email_html(receiver_name: str, gift_limit: int = 25, verification_cod
     </div>
 </body>
 </html>
-"""
+""")
 
 
-def create_kid_email_html(child_name: str, receiver_name: str, gift_limit: int = 25, verification_code: str = "") -> str:
-    """Create festive HTML email content for parent of a kid participant.
-    
-    This email is sent to the parent and shows their child's assignment.
-    """
-    return f"""
+@lru_cache(maxsize=256)
+def create_email_html(receiver_name: str, gift_limit: int = 25, verification_code: str = "") -> str:
+    """Create festive HTML email content."""
+    return _fill(
+        _EMAIL_TEMPLATE,
+        receiver_name=receiver_name,
+        gift_limit=gift_limit,
+        verification_code=verification_code,
+    )
+
+
+_KID_EMAIL_TEMPLATE = _split_template("""
 <!DOCTYPE html>
 <html>
 <head>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, #1a472a 0%, #2d5a3f 100%);
             margin: 0;
             padding: 40px 20px;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 500px;
             margin: 0 auto;
             background: #fff;
             border-radius: 16px;
             padding: 40px;
             box-shadow: 0 10px 40px rgba(0,0,0,0.3);
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             margin-bottom: 30px;
-        }}
-        .snowflakes {{
+        }
+        .snowflakes {
             font-size: 40px;
             letter-spacing: 10px;
-        }}
-        h1 {{
+        }
+        h1 {
             color: #c41e3a;
             margin: 20px 0 10px;
             font-size: 28px;
-        }}
-        .child-banner {{
+        }
+        .child-banner {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 15px 20px;
             border-radius: 10px;
             text-align: center;
             margin-bottom: 20px;
-        }}
-        .child-banner .child-name {{
+        }
+        .child-banner .child-name {
             font-size: 24px;
             font-weight: bold;
-        }}
-        .gift-box {{
+        }
+        .gift-box {
             background: linear-gradient(135deg, #c41e3a 0%, #8b0000 100%);
             color: white;
             padding: 30px;
             border-radius: 12px;
             text-align: center;
             margin: 30px 0;
-        }}
-        .gift-box .label {{
+        }
+        .gift-box .label {
             font-size: 14px;
             opacity: 0.9;
             margin-bottom: 10px;
-        }}
-        .gift-box .name {{
+        }
+        .gift-box .name {
             font-size: 32px;
             font-weight: bold;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-        .info-box {{
+        }
+        .info-box {
             background: #f8f9fa;
             border: 2px solid #28a745;
             padding: 20px;
             border-radius: 12px;
             text-align: center;
             margin: 20px 0;
-        }}
-        .info-box .limit {{
+        }
+        .info-box .limit {
             font-size: 24px;
             font-weight: bold;
             color: #28a745;
-        }}
-        .verification {{
+        }
+        .verification {
             background: #fff3cd;
             border: 2px solid #ffc107;
             padding: 15px;
             border-radius: 8px;
             text-align: center;
             margin: 20px 0;
-        }}
-        .verification .code {{
+        }
+        .verification .code {
             font-size: 28px;
             font-weight: bold;
             font-family: monospace;
             color: #856404;
             letter-spacing: 4px;
-        }}
-        .footer {{
+        }
+        .footer {
             text-align: center;
             color: #666;
             font-size: 14px;
             margin-top: 30px;
-        }}
-        .tree {{
+        }
+        .tree {
             font-size: 50px;
             text-align: center;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -256,40 +330,136 @@ def create_kid_email_html(child_name: str, receiver_name: str, gift_limit: int =
         
         <div class="child-banner">
             <div>👶 Your child</div>
-            <div class="child-name">{child_name}</div>
+            <div class="child-name">${child_name}</div>
         </div>
         
         <div class="gift-box">
             <div class="label">is buying a gift for:</div>
-            <div class="name">🎁 {receiver_name} 🎁</div>
+            <div class="name">🎁 ${receiver_name} 🎁</div>
         </div>
         
         <div class="info-box">
             <div>💰 Gift Limit</div>
-            <div class="limit">${gift_limit}</div>
+            <div class="limit">$$${gift_limit}</div>
         </div>
         
         <div class="verification">
             <div>🔐 Verification Code</div>
-            <div class="code">{verification_code}</div>
+            <div class="code">${verification_code}</div>
             <div style="font-size: 12px; color: #666; margin-top: 10px;">Use this code to verify the assignment is correct</div>
         </div>
         
         <div class="footer">
             <div class="tree">🎄</div>
-            <p>Help {child_name} keep it a secret! 🤫</p>
+            <p>Help ${child_name} keep it a secret! 🤫</p>
             <p>Happy Holidays!</p>
         </div>
     </div>
 </body>
 </html>
-"""
+""")
+
+
+@lru_cache(maxsize=256)
+def create_kid_email_html(child_name: str, receiver_name: str, gift_limit: int = 25, verification_code: str = "") -> str:
+    """Create festive HTML email content for parent of a kid participant.
+    
+    This email is sent to the parent and shows their child's assignment.
+    """
+    return _fill(
+        _KID_EMAIL_TEMPLATE,
+        child_name=child_name,
+        receiver_name=receiver_name,
+        gift_limit=gift_limit,
+        verification_code=verification_code,
+    )
+
+
+# Brevo accepts at most this many messageVersions in a single send_transac_email call
+MAX_MESSAGE_VERSIONS = 1000
+
+# Placeholders Brevo fills in per message version from its params
+_RECEIVER_PARAM = "{{ params.receiver_name }}"
+_CHILD_PARAM = "{{ params.child_name }}"
+_CODE_PARAM = "{{ params.verification_code }}"
+_GIFT_LIMIT_PARAM = "{{ params.gift_limit }}"
+
+
+def _check_config(config: Config) -> None:
+    """Raise EmailError if the config can't be used to send email."""
+    if not config.brevo_api_key:
+        raise EmailError("Brevo API key not configured. Run: santa config --api-key YOUR_KEY")
+    
+    if not config.sender_email:
+        raise EmailError("Sender email not configured. Run: santa config --sender-email YOUR_EMAIL")
+
+
+def _subject_for(assignment: Assignment) -> str:
+    """Email subject line for an assignment."""
+    if assignment.is_kid:
+        return f"🎄 {assignment.giver_name}'s Secret Santa Assignment!"
+    return "🎄 Your Secret Santa Assignment!"
+
+
+def _recipients(assignment: Assignment) -> tuple[list[dict], list[dict]]:
+    """Build the Brevo to/cc lists for an assignment."""
+    to_list = [{"email": assignment.giver_email, "name": assignment.giver_name}]
+    cc_list = []
+    
+    if assignment.parent_email:
+        cc_list.append({"email": assignment.parent_email, "name": "Parent"})
+    
+    return to_list, cc_list
+
+
+def _result_for(assignment: Assignment, subject: str, dry_run: bool) -> dict:
+    """Base result dict describing an assignment email."""
+    return {
+        "to": assignment.giver_email,
+        "cc": assignment.parent_email,
+        "subject": subject,
+        "giver": assignment.giver_name,
+        "receiver": assignment.receiver_name,
+        "dry_run": dry_run,
+    }
+
+
+def _error_result(assignment: Assignment, error: Exception) -> dict:
+    """Result dict for an assignment whose email could not be sent."""
+    return {
+        "to": assignment.giver_email,
+        "status": "error",
+        "error": str(error),
+        "giver": assignment.giver_name,
+    }
+
+
+def _create_api(config: Config, pool_size: int = 1) -> sib_api_v3_sdk.TransactionalEmailsApi:
+    """
+    Create a Brevo transactional email client for the configured API key.
+    
+    pool_size should be at least the number of threads sharing the client,
+    so every in-flight request keeps its connection alive for reuse.
+    """
+    configuration = sib_api_v3_sdk.Configuration()
+    configuration.api_key['api-key'] = config.brevo_api_key
+    configuration.connection_pool_maxsize = max(1, pool_size)
+    
+    return sib_api_v3_sdk.TransactionalEmailsApi(
+        sib_api_v3_sdk.ApiClient(configuration)
+    )
+
+
+def _close_api(api_instance: sib_api_v3_sdk.TransactionalEmailsApi) -> None:
+    """Close the pooled connections held by a Brevo client."""
+    api_instance.api_client.rest_client.pool_manager.clear()
 
 
 def send_assignment_email(
     assignment: Assignment,
     config: Config,
-    dry_run: bool = False
+    dry_run: bool = False,
+    api_instance: Optional[sib_api_v3_sdk.TransactionalEmailsApi] = None
 ) -> dict:
     """
     Send a Secret Santa assignment email.
@@ -298,6 +468,8 @@ def send_assignment_email(
         assignment: The assignment to send
         config: Email configuration with API key
         dry_run: If True, don't actually send, just return what would be sent
+        api_instance: Brevo client to send with, so several sends can share
+            one connection pool. A new client is created if not given.
     
     Returns:
         Dict with send details
@@ -305,11 +477,7 @@ def send_assignment_email(
     Raises:
         EmailError: If sending fails
     """
-    if not config.brevo_api_key:
-        raise EmailError("Brevo API key not configured. Run: santa config --api-key YOUR_KEY")
-    
-    if not config.sender_email:
-        raise EmailError("Sender email not configured. Run: santa config --sender-email YOUR_EMAIL")
+    _check_config(config)
     
     # Use kid-specific email template if this is a kid assignment
     if assignment.is_kid:
@@ -319,41 +487,24 @@ def send_assignment_email(
             gift_limit=config.gift_limit,
             verification_code=assignment.verification_code
         )
-        subject = f"🎄 {assignment.giver_name}'s Secret Santa Assignment!"
     else:
         html_content = create_email_html(
             assignment.receiver_name,
             gift_limit=config.gift_limit,
             verification_code=assignment.verification_code
         )
-        subject = "🎄 Your Secret Santa Assignment!"
-    
-    to_list = [{"email": assignment.giver_email, "name": assignment.giver_name}]
-    cc_list = []
+    subject = _subject_for(assignment)
+    to_list, cc_list = _recipients(assignment)
     
-    if assignment.parent_email:
-        cc_list.append({"email": assignment.parent_email, "name": "Parent"})
-    
-    result = {
-        "to": assignment.giver_email,
-        "cc": assignment.parent_email,
-        "subject": subject,
-        "giver": assignment.giver_name,
-        "receiver": assignment.receiver_name,
-        "dry_run": dry_run,
-    }
+    result = _result_for(assignment, subject, dry_run)
     
     if dry_run:
         result["status"] = "would_send"
         return result
     
-    # Configure Brevo API
-    configuration = sib_api_v3_sdk.Configuration()
-    configuration.api_key['api-key'] = config.brevo_api_key
-    
-    api_instance = sib_api_v3_sdk.TransactionalEmailsApi(
-        sib_api_v3_sdk.ApiClient(configuration)
-    )
+    owns_api = api_instance is None
+    if owns_api:
+        api_instance = _create_api(config)
     
     send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
         to=to_list,
@@ -369,52 +520,298 @@ def send_assignment_email(
         result["message_id"] = api_response.message_id
     except ApiException as e:
         raise EmailError(f"Failed to send email: {e}")
+    finally:
+        if owns_api:
+            _close_api(api_instance)
     
     return result
 
 
+def create_templates(config: Config) -> tuple[int, int]:
+    """
+    Upload the adult and kid emails to Brevo as templates.
+    
+    The templates take every per-email field, including the gift limit, from
+    params, so Brevo renders the HTML and each send carries only params.
+    
+    Returns:
+        (template_id, kid_template_id)
+    
+    Raises:
+        EmailError: If the config is incomplete or the upload fails
+    """
+    _check_config(config)
+    
+    templates = [
+        (
+            "Secret Santa Assignment",
+            "🎄 Your Secret Santa Assignment!",
+            create_email_html(_RECEIVER_PARAM, gift_limit=_GIFT_LIMIT_PARAM, verification_code=_CODE_PARAM),
+        ),
+        (
+            "Secret Santa Kid Assignment",
+            f"🎄 {_CHILD_PARAM}'s Secret Santa Assignment!",
+            create_kid_email_html(_CHILD_PARAM, _RECEIVER_PARAM, gift_limit=_GIFT_LIMIT_PARAM, verification_code=_CODE_PARAM),
+        ),
+    ]
+    
+    api_instance = _create_api(config)
+    ids = []
+    try:
+        for name, subject, html_content in templates:
+            template = sib_api_v3_sdk.CreateSmtpTemplate(
+                template_name=name,
+                subject=subject,
+                html_content=html_content,
+                sender={"email": config.sender_email, "name": config.sender_name},
+                is_active=True,
+            )
+            ids.append(api_instance.create_smtp_template(template).id)
+    except ApiException as e:
+        raise EmailError(f"Failed to create email templates: {e}")
+    finally:
+        _close_api(api_instance)
+    
+    return ids[0], ids[1]
+
+
+def _send_batch(
+    api_instance: sib_api_v3_sdk.TransactionalEmailsApi,
+    batch: list[Assignment],
+    config: Config,
+    limiter: Optional[RateLimiter] = None
+) -> list[dict]:
+    """
+    Send a batch of same-template assignments in one Brevo API call.
+    
+    If a Brevo template is configured for the batch's kind, Brevo renders
+    it; otherwise the HTML is rendered once with Brevo params placeholders.
+    Each assignment becomes a message version carrying its own recipients,
+    subject and params.
+    
+    Results are marked "sent" with their message id only when Brevo returns
+    one id per message version. Otherwise Brevo's reply can't be matched to
+    the emails, so every result gets status "unknown" and is not reported
+    as sent.
+    
+    Raises:
+        EmailError: If the API call fails (no email in the batch was sent)
+    """
+    template_id = config.kid_template_id if batch[0].is_kid else config.template_id
+    
+    if template_id:
+        html_content = None
+    elif batch[0].is_kid:
+        html_content = create_kid_email_html(
+            child_name=_CHILD_PARAM,
+            receiver_name=_RECEIVER_PARAM,
+            gift_limit=config.gift_limit,
+            verification_code=_CODE_PARAM
+        )
+    else:
+        html_content = create_email_html(
+            _RECEIVER_PARAM,
+            gift_limit=config.gift_limit,
+            verification_code=_CODE_PARAM
+        )
+    
+    versions = []
+    results = []
+    for assignment in batch:
+        subject = _subject_for(assignment)
+        to_list, cc_list = _recipients(assignment)
+        versions.append(sib_api_v3_sdk.SendSmtpEmailMessageVersions(
+            to=to_list,
+            cc=cc_list if cc_list else None,
+            subject=subject,
+            params={
+                "receiver_name": assignment.receiver_name,
+                "child_name": assignment.giver_name,
+                "verification_code": assignment.verification_code,
+                "gift_limit": config.gift_limit,
+            },
+        ))
+        results.append(_result_for(assignment, subject, dry_run=False))
+    
+    send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
+        sender={"email": config.sender_email, "name": config.sender_name},
+        subject=versions[0].subject,
+        html_content=html_content,
+        template_id=template_id,
+        message_versions=versions,
+    )
+    
+    if limiter:
+        limiter.acquire()
+    
+    try:
+        api_response = api_instance.send_transac_email(send_smtp_email)
+    except ApiException as e:
+        raise EmailError(f"Failed to send email: {e}") from e
+    
+    message_ids = api_response.message_ids or [api_response.message_id]
+    if len(message_ids) != len(results):
+        error = (
+            f"Brevo returned {len(message_ids)} message ids for {len(results)} emails; "
+            "check the Brevo logs before resending"
+        )
+        for result in results:
+            result["status"] = "unknown"
+            result["error"] = error
+        return results
+    
+    for result, message_id in zip(results, message_ids):
+        result["status"] = "sent"
+        result["message_id"] = message_id
+    
+    return results
+
+
+# Errors that would fail every request the same way, so splitting won't help
+_UNSPLITTABLE_STATUSES = {401, 403}
+
+
+def _send_batch_isolated(
+    api_instance: sib_api_v3_sdk.TransactionalEmailsApi,
+    batch: list[Assignment],
+    config: Config,
+    limiter: Optional[RateLimiter] = None
+) -> list[dict]:
+    """
+    Send a batch, isolating failures to the emails that cause them.
+    
+    If Brevo rejects the batch, it is split in half and each half retried,
+    down to single emails, so one bad recipient only fails its own email.
+    Authentication errors fail the whole batch at once. Never raises;
+    failed emails get error results.
+    """
+    try:
+        return _send_batch(api_instance, batch, config, limiter)
+    except EmailError as e:
+        cause = e.__cause__
+        if len(batch) == 1 or getattr(cause, "status", None) in _UNSPLITTABLE_STATUSES:
+            return [_error_result(assignment, e) for assignment in batch]
+    
+    middle = len(batch) // 2
+    return (
+        _send_batch_isolated(api_instance, batch[:middle], config, limiter)
+        + _send_batch_isolated(api_instance, batch[middle:], config, limiter)
+    )
+
+
+def _batch_indices(assignments: list[Assignment], pending: list[int]) -> list[list[int]]:
+    """Group pending assignment indices by email template, in API-sized chunks."""
+    by_template: dict[bool, list[int]] = {}
+    for i in pending:
+        by_template.setdefault(assignments[i].is_kid, []).append(i)
+    
+    return [
+        group[start:start + MAX_MESSAGE_VERSIONS]
+        for group in by_template.values()
+        for start in range(0, len(group), MAX_MESSAGE_VERSIONS)
+    ]
+
+
 def send_all_assignments(
     assignments: list[Assignment],
     config: Config,
     dry_run: bool = False,
-    on_progress: Optional[callable] = None
+    on_progress: Optional[callable] = None,
+    workers: int = 8,
+    rate_limit: Optional[float] = DEFAULT_RATE_LIMIT
 ) -> list[dict]:
     """
     Send emails for all assignments.
     
+    Pending emails are grouped by template (adult or kid) and each group is
+    sent with a single Brevo call using per-recipient message versions,
+    split into chunks of MAX_MESSAGE_VERSIONS. Chunks are sent concurrently
+    from a thread pool. A chunk Brevo rejects is split and retried, so a bad
+    recipient only fails their own email.
+    
     Args:
         assignments: List of assignments to send
         config: Email configuration
         dry_run: If True, don't actually send
-        on_progress: Optional callback(assignment, result) for progress updates
+        on_progress: Optional callback(assignment, result) for progress updates,
+            called from the calling thread as each send completes
+        workers: Maximum number of API calls in flight at once
+        rate_limit: Maximum API calls per second, or None for no limit
     
     Returns:
-        List of send results
+        List of send results, in the same order as assignments
     """
-    results = []
+    # Partition up front: already-sent results are final, and only the
+    # pending indices go on to be batched
+    skip_sent = not dry_run
+    results: list[Optional[dict]] = [
+        {"to": a.giver_email, "status": "already_sent", "giver": a.giver_name}
+        if skip_sent and a.email_sent else None
+        for a in assignments
+    ]
+    pending = [i for i, result in enumerate(results) if result is None]
     
-    for assignment in assignments:
-        if assignment.email_sent and not dry_run:
-            results.append({
-                "to": assignment.giver_email,
-                "status": "already_sent",
-                "giver": assignment.giver_name,
-            })
-            continue
-        
-        try:
-            result = send_assignment_email(assignment, config, dry_run)
-            results.append(result)
-            
+    if dry_run:
+        for i in pending:
+            assignment = assignments[i]
+            try:
+                result = send_assignment_email(assignment, config, dry_run=True)
+            except EmailError as e:
+                results[i] = _error_result(assignment, e)
+                continue
+            results[i] = result
             if on_progress:
                 on_progress(assignment, result)
-                
-        except EmailError as e:
-            results.append({
-                "to": assignment.giver_email,
-                "status": "error",
-                "error": str(e),
-                "giver": assignment.giver_name,
-            })
+        return results
+    
+    if not pending:
+        return results
+    
+    try:
+        _check_config(config)
+    except EmailError as e:
+        for i in pending:
+            results[i] = _error_result(assignments[i], e)
+        return results
+    
+    batches = _batch_indices(assignments, pending)
+    max_workers = max(1, min(workers, len(batches)))
+    # One client and connection pool for the whole run
+    api_instance = _create_api(config, pool_size=max_workers)
+    
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+    
+    try:
+        _dispatch_batches(assignments, batches, config, api_instance, limiter, results, on_progress, max_workers)
+    finally:
+        _close_api(api_instance)
     
     return results
+
+
+def _dispatch_batches(
+    assignments: list[Assignment],
+    batches: list[list[int]],
+    config: Config,
+    api_instance: sib_api_v3_sdk.TransactionalEmailsApi,
+    limiter: Optional[RateLimiter],
+    results: list[Optional[dict]],
+    on_progress: Optional[callable],
+    max_workers: int
+) -> None:
+    """
+    Send batches from a thread pool, filling results in place.
+    
+    on_progress is called for every result except errors.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_send_batch_isolated, api_instance, [assignments[i] for i in batch], config, limiter): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            for i, result in zip(batch, future.result()):
+                results[i] = result
+                if on_progress and result["status"] != "error":
+                    on_progress(assignments[i], result)
@@ -1,5 +1,6 @@
 """Matchmaking algorithm for Secret Santa assignments."""
 
+from collections import Counter
 import hashlib
 import random
 from uuid import UUID
@@ -8,6 +9,10 @@ from .models import Participant, Assignment
 from .storage import Storage
 
 
+# Uniform draws to try per group before falling back to matching + shuffling
+SAMPLE_ATTEMPTS = 1000
+
+
 def generate_verification_code(giver_id: UUID, receiver_id: UUID) -> str:
     """
     Generate a 4-character verification code from giver and receiver IDs.
@@ -15,9 +20,11 @@ def generate_verification_code(giver_id: UUID, receiver_id: UUID) -> str:
     This code is deterministic and can be used by participants to verify
     their assignment matches what they received in their email.
     """
-    combined = f"{giver_id}:{receiver_id}"
-    hash_digest = hashlib.sha256(combined.encode()).hexdigest()
-    return hash_digest[:4].upper()
+    # Codes are stored on each assignment when it is created, so changing
+    # the hash only affects assignments made from now on
+    h = hashlib.blake2b(giver_id.bytes, digest_size=2)
+    h.update(receiver_id.bytes)
+    return h.hexdigest().upper()
 
 
 class MatcherError(Exception):
@@ -27,7 +34,9 @@ class MatcherError(Exception):
 
 def create_assignments(
     storage: Storage,
-    max_attempts: int = 1000,
+    *,
+    max_attempts: int | None = None,
+    swap_rounds: int | None = None,
     separate_kids: bool = False
 ) -> list[Assignment]:
     """
@@ -36,11 +45,19 @@ def create_assignments(
     Algorithm:
     1. If separate_kids is True, match kids only with other kids
     2. For each person, find valid receivers (not self, not same cluster)
-    3. Use backtracking if we get stuck
+    3. Draw uniformly random permutations of each group (kids, adults, or
+       everyone) until one is valid, so every valid assignment is equally likely
+    4. If a group is too constrained for that to succeed within
+       max_attempts draws, find a perfect matching with augmenting paths
+       instead (always found when one exists) and randomize it with swap and
+       rotation moves that keep every giver valid
     
     Args:
         storage: Storage instance to get participants and clusters
-        max_attempts: Maximum shuffle attempts before giving up
+        max_attempts: Uniform draws to try per group before falling back to
+            matching (default: SAMPLE_ATTEMPTS)
+        swap_rounds: Number of random moves for the fallback shuffle; only
+            used when the fallback runs (default: 20 per participant)
         separate_kids: If True, kids only match with kids, adults with adults
     
     Returns:
@@ -54,16 +71,6 @@ def create_assignments(
     if len(participants) < 2:
         raise MatcherError("Need at least 2 participants for Secret Santa!")
     
-    # Build cluster membership map
-    cluster_map: dict[UUID, UUID | None] = {}
-    for p in participants:
-        cluster_map[p.id] = p.cluster_id
-    
-    # Build kid map
-    kid_map: dict[UUID, bool] = {}
-    for p in participants:
-        kid_map[p.id] = p.is_kid
-    
     # If separating kids, validate kid group sizes
     if separate_kids:
         kids = [p for p in participants if p.is_kid]
@@ -77,87 +84,260 @@ def create_assignments(
             )
         
         # Check if matchmaking is possible for each group
-        _validate_cluster_sizes(kids, cluster_map, "kids")
-        _validate_cluster_sizes(adults, cluster_map, "adults")
+        _validate_cluster_sizes(kids, "kids")
+        _validate_cluster_sizes(adults, "adults")
     else:
         # Without separation, validate all participants together
-        _validate_cluster_sizes(participants, cluster_map, "participants")
+        _validate_cluster_sizes(participants, "participants")
+    
+    candidates = _build_candidates(participants, separate_kids)
+    
+    if separate_kids:
+        groups = [
+            [i for i, p in enumerate(participants) if p.is_kid],
+            [i for i, p in enumerate(participants) if not p.is_kid],
+        ]
+    else:
+        groups = [list(range(len(participants)))]
     
-    # Try to find valid assignments
-    for attempt in range(max_attempts):
-        result = _try_assign(participants, cluster_map, kid_map, separate_kids)
-        if result is not None:
-            return result
+    if max_attempts is None:
+        max_attempts = SAMPLE_ATTEMPTS
+    receiver_of = _sample_matching(groups, candidates, max_attempts)
+    if receiver_of is None:
+        receiver_of = _find_matching(candidates)
+        if receiver_of is None:
+            raise MatcherError(
+                "Could not find valid assignments. "
+                "This may happen with complex cluster configurations."
+            )
+        
+        if swap_rounds is None:
+            swap_rounds = 20 * len(participants)
+        _shuffle_matching(receiver_of, candidates, swap_rounds)
     
-    raise MatcherError(
-        f"Could not find valid assignments after {max_attempts} attempts. "
-        "This may happen with complex cluster configurations."
-    )
+    return _build_assignments(participants, list(enumerate(receiver_of)))
 
 
 def _validate_cluster_sizes(
     group: list[Participant],
-    cluster_map: dict[UUID, UUID | None],
     group_name: str
 ) -> None:
     """Validate that no cluster has more than half of the group."""
     if len(group) < 2:
         return  # Skip validation for empty or single-person groups
     
-    cluster_counts: dict[UUID | None, int] = {}
-    for p in group:
-        cid = p.cluster_id
-        cluster_counts[cid] = cluster_counts.get(cid, 0) + 1
+    cluster_counts = Counter(p.cluster_id for p in group if p.cluster_id is not None)
+    if not cluster_counts:
+        return
     
-    half = len(group) / 2
-    for cid, count in cluster_counts.items():
-        if cid is not None and count > half:
-            raise MatcherError(
-                f"Cluster has {count} members but only {len(group)} {group_name}. "
-                f"Each cluster must have less than half of the {group_name} for valid matching."
-            )
+    # Only the largest cluster can break the limit
+    [(_, count)] = cluster_counts.most_common(1)
+    if 2 * count > len(group):
+        raise MatcherError(
+            f"Cluster has {count} members but only {len(group)} {group_name}. "
+            f"Each cluster must have less than half of the {group_name} for valid matching."
+        )
 
 
-def _try_assign(
+def _build_candidates(
     participants: list[Participant],
-    cluster_map: dict[UUID, UUID | None],
-    kid_map: dict[UUID, bool],
     separate_kids: bool
-) -> list[Assignment] | None:
+) -> list[int]:
     """
-    Attempt to create valid assignments using randomized approach.
+    Precompute each giver's allowed receivers as a bitmask over participant indices.
     
-    Returns None if this attempt failed.
+    Bit j of candidates[i] is set when participant i may give to participant j:
+    j is in i's bucket (everyone, or only kids/adults with separate_kids) and
+    is neither i nor a member of i's cluster.
     """
-    givers = participants.copy()
-    receivers = participants.copy()
-    random.shuffle(givers)
-    random.shuffle(receivers)
+    all_mask = (1 << len(participants)) - 1
+    kid_mask = 0
+    cluster_masks: dict[UUID, int] = {}
+    for i, p in enumerate(participants):
+        bit = 1 << i
+        if p.is_kid:
+            kid_mask |= bit
+        if p.cluster_id is not None:
+            cluster_masks[p.cluster_id] = cluster_masks.get(p.cluster_id, 0) | bit
     
-    assignments: list[Assignment] = []
-    used_receivers: set[UUID] = set()
+    candidates: list[int] = []
+    for i, p in enumerate(participants):
+        if separate_kids:
+            bucket = kid_mask if p.is_kid else all_mask & ~kid_mask
+        else:
+            bucket = all_mask
+        forbidden = cluster_masks.get(p.cluster_id, 0) | (1 << i)
+        candidates.append(bucket & ~forbidden)
+    
+    return candidates
+
+
+def _sample_matching(groups: list[list[int]], candidates: list[int], attempts: int) -> list[int] | None:
+    """
+    Draw each group's receivers uniformly, or None if any group runs out of attempts.
+    
+    Groups can't give to each other, so uniform draws per group give a
+    uniform draw over the whole roster. Returns receiver_of, indexed by giver.
+    """
+    receiver_of = [-1] * len(candidates)
+    for group in groups:
+        receivers = _sample_group(group, candidates, attempts)
+        if receivers is None:
+            return None
+        for giver, receiver in zip(group, receivers):
+            receiver_of[giver] = receiver
+    return receiver_of
+
+
+def _sample_group(group: list[int], candidates: list[int], attempts: int) -> list[int] | None:
+    """
+    Uniformly random valid receivers for a group of givers, or None.
+    
+    Each attempt is a Fisher-Yates shuffle of the group that stops at the
+    first giver left without a valid receiver. Stopping early rejects the
+    same draws as checking a finished shuffle would, only sooner, so an
+    accepted result is uniform over all valid assignments of the group.
+    Returns receivers aligned with group.
+    """
+    n = len(group)
+    for _ in range(attempts):
+        pool = group[:]
+        for k in range(n):
+            j = random.randrange(k, n)
+            pool[k], pool[j] = pool[j], pool[k]
+            if not candidates[group[k]] >> pool[k] & 1:
+                break
+        else:
+            return pool
+    return None
+
+
+def _random_bit(mask: int) -> int:
+    """Index of a uniformly random set bit in a non-zero mask."""
+    for _ in range(random.randrange(mask.bit_count())):
+        mask &= mask - 1  # drop the lowest set bit
+    return (mask & -mask).bit_length() - 1
+
+
+def _find_matching(candidates: list[int]) -> list[int] | None:
+    """
+    Find a receiver for every giver, or None if no valid assignment exists.
+    
+    Givers are taken in random order and grab a random free receiver when
+    they have one; otherwise an augmenting path (BFS over already-matched
+    givers) frees one up. Returns receiver_of, indexed by giver.
+    """
+    n = len(candidates)
+    receiver_of = [-1] * n
+    giver_of = [-1] * n
+    free = (1 << n) - 1
+    
+    givers = list(range(n))
+    random.shuffle(givers)
     
     for giver in givers:
-        giver_is_kid = kid_map.get(giver.id, False)
+        direct = candidates[giver] & free
+        if direct:
+            receiver = _random_bit(direct)
+            receiver_of[giver] = receiver
+            giver_of[receiver] = giver
+            free &= ~(1 << receiver)
+            continue
         
-        # Find valid receivers for this giver
-        valid_receivers = [
-            r for r in receivers
-            if r.id not in used_receivers
-            and r.id != giver.id  # Can't give to self
-            and not _same_cluster(giver.id, r.id, cluster_map)  # Can't give to cluster member
-            and (not separate_kids or kid_map.get(r.id, False) == giver_is_kid)  # Kids match kids only if separate_kids
-        ]
-        
-        if not valid_receivers:
-            # This attempt failed
+        receiver = _augment(giver, candidates, receiver_of, giver_of)
+        if receiver is None:
             return None
-        
-        # Pick a random valid receiver
-        receiver = random.choice(valid_receivers)
-        used_receivers.add(receiver.id)
-        
-        assignments.append(Assignment(
+        free &= ~(1 << receiver)
+    
+    return receiver_of
+
+
+def _augment(
+    start: int,
+    candidates: list[int],
+    receiver_of: list[int],
+    giver_of: list[int]
+) -> int | None:
+    """
+    Match start by shifting givers along an augmenting path.
+    
+    Updates receiver_of/giver_of in place and returns the newly claimed
+    free receiver, or None if no augmenting path exists.
+    """
+    reached_by: dict[int, int] = {}  # receiver -> giver whose edge reached it
+    seen = 0
+    queue = [start]
+    
+    for giver in queue:
+        options = candidates[giver] & ~seen
+        seen |= options
+        while options:
+            # Random order, so the path found doesn't favor low indices
+            receiver = _random_bit(options)
+            options &= ~(1 << receiver)
+            reached_by[receiver] = giver
+            if giver_of[receiver] == -1:
+                # Flip the path back to start
+                claimed = receiver
+                while receiver != -1:
+                    giver = reached_by[receiver]
+                    previous = receiver_of[giver]
+                    receiver_of[giver] = receiver
+                    giver_of[receiver] = giver
+                    receiver = previous
+                return claimed
+            queue.append(giver_of[receiver])
+    
+    return None
+
+
+def _shuffle_matching(receiver_of: list[int], candidates: list[int], rounds: int) -> None:
+    """
+    Randomize a valid matching in place.
+    
+    Each round either swaps the receivers of two givers or rotates the
+    receivers of three, and keeps the move only if every giver involved
+    still has a valid receiver. Rotations let rosters move between circles
+    that no single swap connects, such as the two gift circles of three
+    people.
+    """
+    n = len(receiver_of)
+    for _ in range(rounds):
+        a = random.randrange(n)
+        b = random.randrange(n)
+        ra = receiver_of[a]
+        rb = receiver_of[b]
+        if n >= 3 and random.getrandbits(1):
+            c = random.randrange(n)
+            rc = receiver_of[c]
+            if a == b or b == c or a == c:
+                continue
+            # a takes b's receiver, b takes c's, c takes a's
+            if candidates[a] >> rb & 1 and candidates[b] >> rc & 1 and candidates[c] >> ra & 1:
+                receiver_of[a] = rb
+                receiver_of[b] = rc
+                receiver_of[c] = ra
+        elif candidates[a] >> rb & 1 and candidates[b] >> ra & 1:
+            receiver_of[a] = rb
+            receiver_of[b] = ra
+
+
+def _build_assignments(
+    participants: list[Participant],
+    pairs: list[tuple[int, int]]
+) -> list[Assignment]:
+    """
+    Turn (giver, receiver) index pairs into Assignment objects.
+    
+    Every field is copied from already-validated Participants, so the
+    assignments are built with model_construct rather than re-validated.
+    """
+    assignments: list[Assignment] = []
+    
+    for giver_idx, receiver_idx in pairs:
+        giver = participants[giver_idx]
+        receiver = participants[receiver_idx]
+        assignments.append(Assignment.model_construct(
             giver_id=giver.id,
             receiver_id=receiver.id,
             giver_name=giver.name,
@@ -170,17 +350,3 @@ def _try_assign(
         ))
     
     return assignments
-
-
-def _same_cluster(id1: UUID, id2: UUID, cluster_map: dict[UUID, UUID | None]) -> bool:
-    """Check if two participants are in the same cluster."""
-    c1 = cluster_map.get(id1)
-    c2 = cluster_map.get(id2)
-    
-    # If either has no cluster, they're not in the same cluster
-    if c1 is None or c2 is None:
-        return False
-    
-    return c1 == c2
-
-
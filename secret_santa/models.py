@@ -1,16 +1,32 @@
 """Pydantic models for Secret Santa data validation."""
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
 from typing import Optional
 from uuid import UUID, uuid4
 
 
+def validate_email(value: str) -> str:
+    """Check an email address from user input and return its normalized form.
+
+    Emails are validated once, where they enter the app (CLI commands), and
+    stored as plain strings so models never re-run the check.
+
+    Raises ValueError if the address is invalid.
+    """
+    from email_validator import validate_email as _validate, EmailNotValidError
+
+    try:
+        return _validate(value, check_deliverability=False).normalized
+    except EmailNotValidError as e:
+        raise ValueError(f"Invalid email address '{value}': {e}") from e
+
+
 class Participant(BaseModel):
     """A person participating in the Secret Santa exchange."""
     id: UUID = Field(default_factory=uuid4)
     name: str
-    email: EmailStr
-    parent_email: Optional[EmailStr] = None
+    email: str
+    parent_email: Optional[str] = None
     cluster_id: Optional[UUID] = None
     is_kid: bool = False  # Kids are matched only with other kids
 
@@ -28,9 +44,9 @@ class Assignment(BaseModel):
     receiver_id: UUID
     giver_name: str
     receiver_name: str
-    giver_email: EmailStr
-    receiver_email: EmailStr
-    parent_email: Optional[EmailStr] = None
+    giver_email: str
+    receiver_email: str
+    parent_email: Optional[str] = None
     email_sent: bool = False
     verification_code: str = ""  # 4-char code for participant to verify their match
     is_kid: bool = False  # Whether giver is a kid (parent receives email with child-specific content)
@@ -39,9 +55,11 @@ class Assignment(BaseModel):
 class Config(BaseModel):
     """Application configuration for email sending."""
     brevo_api_key: Optional[str] = None
-    sender_email: Optional[EmailStr] = None
+    sender_email: Optional[str] = None
     sender_name: str = "Secret Santa"
     gift_limit: int = 25  # Dollar limit for gifts
+    template_id: Optional[int] = None  # Brevo template for adult emails
+    kid_template_id: Optional[int] = None  # Brevo template for kid emails
 
 
 class SecretSantaData(BaseModel):
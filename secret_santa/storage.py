@@ -1,19 +1,112 @@
 """JSON file storage for Secret Santa data."""
 
+from contextlib import contextmanager
+import hashlib
 import json
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from uuid import UUID
 
+from pydantic import ValidationError
+
 from .models import SecretSantaData, Participant, Cluster, Assignment, Config
 
 
-class UUIDEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles UUID objects."""
-    def default(self, obj):
-        if isinstance(obj, UUID):
-            return str(obj)
-        return super().default(obj)
+def _digest(payload: bytes) -> bytes:
+    """Short fingerprint of a serialized store, used to skip identical writes."""
+    return hashlib.blake2b(payload, digest_size=8).digest()
+
+
+# The JSON type of every field Storage writes (UUIDs are still strings).
+# model_construct trusts its input completely, so _fast_load only accepts
+# records with exactly these keys and types.
+_OPT_STR = (str, type(None))
+_OPT_INT = (int, type(None))
+_SHAPES = {
+    "participant": {
+        "id": (str,), "name": (str,), "email": (str,), "parent_email": _OPT_STR,
+        "cluster_id": _OPT_STR, "is_kid": (bool,),
+    },
+    "cluster": {"id": (str,), "name": (str,), "member_ids": (list,)},
+    "assignment": {
+        "giver_id": (str,), "receiver_id": (str,), "giver_name": (str,), "receiver_name": (str,),
+        "giver_email": (str,), "receiver_email": (str,), "parent_email": _OPT_STR,
+        "email_sent": (bool,), "verification_code": (str,), "is_kid": (bool,),
+    },
+    "config": {
+        "brevo_api_key": _OPT_STR, "sender_email": _OPT_STR, "sender_name": (str,),
+        "gift_limit": (int,), "template_id": _OPT_INT, "kid_template_id": _OPT_INT,
+    },
+    "data": {"participants": (list,), "clusters": (list,), "assignments": (list,), "config": (dict,)},
+}
+
+
+def _check_shape(record, kind: str) -> None:
+    """Raise ValueError unless record has exactly the keys and JSON types Storage writes."""
+    shape = _SHAPES[kind]
+    if type(record) is not dict or record.keys() != shape.keys():
+        raise ValueError(f"Unexpected {kind} fields")
+    for key, types in shape.items():
+        # Exact type match, so JSON true isn't accepted as an int or 1 as a bool
+        if type(record[key]) not in types:
+            raise ValueError(f"Unexpected type for {kind} field {key!r}")
+
+
+def _fast_load(raw: dict) -> SecretSantaData:
+    """Build the store from JSON this app wrote, skipping re-validation.
+
+    The data file is only ever written by Storage from validated models, so
+    the models are assembled with model_construct and only the UUID fields
+    are converted. model_construct accepts anything, so every record is first
+    checked against _SHAPES; a file with missing, extra or mistyped fields
+    (hand-edited, truncated, or from an older version) raises ValueError and
+    load() falls back to full validation.
+    """
+    # Participant ids reappear as cluster members and assignment givers and
+    # receivers; parse each distinct string once and share the UUID object
+    parsed: dict[str, UUID] = {}
+
+    def to_uuid(value: str) -> UUID:
+        uuid = parsed.get(value)
+        if uuid is None:
+            uuid = parsed[value] = UUID(value)
+        return uuid
+
+    _check_shape(raw, "data")
+
+    participants = []
+    for p in raw["participants"]:
+        _check_shape(p, "participant")
+        p = dict(p)
+        p["id"] = to_uuid(p["id"])
+        if p.get("cluster_id") is not None:
+            p["cluster_id"] = to_uuid(p["cluster_id"])
+        participants.append(Participant.model_construct(**p))
+
+    clusters = []
+    for c in raw["clusters"]:
+        _check_shape(c, "cluster")
+        c = dict(c)
+        c["id"] = to_uuid(c["id"])
+        c["member_ids"] = [to_uuid(m) for m in c["member_ids"]]
+        clusters.append(Cluster.model_construct(**c))
+
+    assignments = []
+    for a in raw["assignments"]:
+        _check_shape(a, "assignment")
+        a = dict(a)
+        a["giver_id"] = to_uuid(a["giver_id"])
+        a["receiver_id"] = to_uuid(a["receiver_id"])
+        assignments.append(Assignment.model_construct(**a))
+
+    _check_shape(raw["config"], "config")
+    return SecretSantaData.model_construct(
+        participants=participants,
+        clusters=clusters,
+        assignments=assignments,
+        config=Config.model_construct(**raw["config"]),
+    )
 
 
 class Storage:
@@ -28,6 +121,16 @@ class Storage:
         self.data_file = self.data_dir / "data.json"
         self._ensure_data_dir()
         self._data: Optional[SecretSantaData] = None
+        self._p_by_id: dict[UUID, Participant] = {}
+        self._p_by_name: dict[str, Participant] = {}
+        self._c_by_name: dict[str, Cluster] = {}
+        self._a_by_giver: dict[UUID, Assignment] = {}
+        self._members: dict[UUID, set[UUID]] = {}
+        self._env_loaded = False
+        self._config: Optional[Config] = None
+        self._batch_depth = 0
+        self._last_hash: Optional[bytes] = None
+        self._dirty = False
 
     def _ensure_data_dir(self) -> None:
         """Create data directory if it doesn't exist."""
@@ -42,29 +145,92 @@ class Storage:
             self._data = SecretSantaData()
             self.save()
         else:
+            raw = self.data_file.read_bytes()
+            self._last_hash = _digest(raw)
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    raw_data = json.load(f)
-                self._data = SecretSantaData.model_validate(raw_data)
-            except (json.JSONDecodeError, Exception):
-                # Corrupted file, start fresh
-                self._data = SecretSantaData()
-                self.save()
-
+                self._data = _fast_load(json.loads(raw))
+            except (ValueError, TypeError, KeyError, AttributeError):
+                # Not in the shape this app writes; let pydantic sort it out
+                try:
+                    self._data = SecretSantaData.model_validate_json(raw)
+                except (ValidationError, Exception):
+                    # Corrupted file, start fresh
+                    self._data = SecretSantaData()
+                    self.save()
+
+        self._build_indexes()
         return self._data
 
+    def _build_indexes(self) -> None:
+        """Build in-memory lookup tables over the loaded data.
+
+        Name indexes are keyed by lowercased name; when names collide the
+        first one in the list wins, matching the old linear scans.
+        """
+        self._p_by_id = {p.id: p for p in self._data.participants}
+        self._p_by_name = {}
+        for p in self._data.participants:
+            self._p_by_name.setdefault(p.name.lower(), p)
+        self._c_by_name = {}
+        for c in self._data.clusters:
+            self._c_by_name.setdefault(c.name.lower(), c)
+        self._a_by_giver = {a.giver_id: a for a in self._data.assignments}
+        # member_ids stays the ordered, serialized list; the sets mirror it
+        # for O(1) membership checks
+        self._members = {c.id: set(c.member_ids) for c in self._data.clusters}
+
     def save(self) -> None:
-        """Save current data to JSON file."""
+        """Save current data to JSON file (deferred while inside a transaction)."""
         if self._data is None:
             return
+        if self._batch_depth:
+            self._dirty = True
+            return
+        self._write()
 
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(
-                self._data.model_dump(),
-                f,
-                indent=2,
-                cls=UUIDEncoder
-            )
+    def flush(self) -> None:
+        """Write any changes buffered by an open transaction right away."""
+        if self._dirty:
+            self._dirty = False
+            self._write()
+
+    def _write(self) -> None:
+        """Write current data to the JSON file.
+
+        The data goes to a temporary file that then replaces data.json, so a
+        crash mid-write can never leave a truncated store behind.
+        """
+        # Serialize straight to JSON in pydantic-core, without building an
+        # intermediate dict, and write the document in one call. The file is
+        # machine-written, so it's compact; export_pretty() is for reading
+        payload = self._data.model_dump_json().encode('utf-8')
+        digest = _digest(payload)
+        if digest == self._last_hash:
+            return  # Nothing changed since the last read or write
+        tmp_file = self.data_file.with_suffix('.json.tmp')
+        tmp_file.write_bytes(payload)
+        os.replace(tmp_file, self.data_file)
+        self._last_hash = digest
+
+    def export_pretty(self, path: Path) -> None:
+        """Write an indented copy of all data to path for people to read."""
+        Path(path).write_text(self.load().model_dump_json(indent=2), encoding='utf-8')
+
+    @contextmanager
+    def transaction(self) -> Iterator["Storage"]:
+        """Buffer saves made inside the block and write the file once on exit.
+
+        Transactions nest; only the outermost one writes. The file is
+        written even if the block raises, so disk never falls behind the
+        in-memory data for the changes that did happen.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
 
     # Participant operations
     def add_participant(self, participant: Participant) -> Participant:
@@ -77,40 +243,49 @@ class Storage:
                 if not p.is_kid and not participant.is_kid:
                     raise ValueError(f"Participant with email {participant.email} already exists")
         data.participants.append(participant)
+        self._p_by_id[participant.id] = participant
+        self._p_by_name.setdefault(participant.name.lower(), participant)
         self.save()
         return participant
 
     def get_participant_by_name(self, name: str) -> Optional[Participant]:
         """Find a participant by name (case-insensitive)."""
-        data = self.load()
-        name_lower = name.lower()
-        for p in data.participants:
-            if p.name.lower() == name_lower:
-                return p
-        return None
+        self.load()
+        return self._p_by_name.get(name.lower())
 
     def get_participant_by_id(self, id: UUID) -> Optional[Participant]:
         """Find a participant by ID."""
-        data = self.load()
-        for p in data.participants:
-            if p.id == id:
-                return p
-        return None
+        self.load()
+        return self._p_by_id.get(id)
+
+    def participants_by_id(self) -> dict[UUID, Participant]:
+        """Get all participants keyed by ID, for bulk lookups.
+
+        This is the live index; callers must not modify it.
+        """
+        self.load()
+        return self._p_by_id
 
     def remove_participant(self, name: str) -> bool:
         """Remove a participant by name. Returns True if found and removed."""
         data = self.load()
         name_lower = name.lower()
-        for i, p in enumerate(data.participants):
-            if p.name.lower() == name_lower:
-                # Also remove from any clusters
-                for cluster in data.clusters:
-                    if p.id in cluster.member_ids:
-                        cluster.member_ids.remove(p.id)
-                data.participants.pop(i)
-                self.save()
-                return True
-        return False
+        p = self._p_by_name.get(name_lower)
+        if p is None:
+            return False
+
+        # Also remove from any clusters
+        self._leave_clusters(p.id)
+        data.participants.remove(p)
+        self._p_by_id.pop(p.id, None)
+        del self._p_by_name[name_lower]
+        # Let a remaining participant with the same name take over the slot
+        for other in data.participants:
+            if other.name.lower() == name_lower:
+                self._p_by_name[name_lower] = other
+                break
+        self.save()
+        return True
 
     def list_participants(self) -> list[Participant]:
         """Get all participants."""
@@ -121,27 +296,25 @@ class Storage:
         """Create a new cluster."""
         data = self.load()
         # Check for duplicate name
-        for c in data.clusters:
-            if c.name.lower() == cluster.name.lower():
-                raise ValueError(f"Cluster '{cluster.name}' already exists")
+        name_lower = cluster.name.lower()
+        if name_lower in self._c_by_name:
+            raise ValueError(f"Cluster '{cluster.name}' already exists")
         data.clusters.append(cluster)
+        self._c_by_name[name_lower] = cluster
+        self._members[cluster.id] = set(cluster.member_ids)
         self.save()
         return cluster
 
     def get_cluster_by_name(self, name: str) -> Optional[Cluster]:
         """Find a cluster by name (case-insensitive)."""
-        data = self.load()
-        name_lower = name.lower()
-        for c in data.clusters:
-            if c.name.lower() == name_lower:
-                return c
-        return None
+        self.load()
+        return self._c_by_name.get(name.lower())
 
     def add_to_cluster(self, cluster_name: str, participant_name: str) -> None:
         """Add a participant to a cluster."""
-        data = self.load()
-        cluster = self.get_cluster_by_name(cluster_name)
-        participant = self.get_participant_by_name(participant_name)
+        self.load()
+        cluster = self._c_by_name.get(cluster_name.lower())
+        participant = self._p_by_name.get(participant_name.lower())
 
         if cluster is None:
             raise ValueError(f"Cluster '{cluster_name}' not found")
@@ -149,36 +322,38 @@ class Storage:
             raise ValueError(f"Participant '{participant_name}' not found")
 
         # Remove from previous cluster if any
-        for c in data.clusters:
-            if participant.id in c.member_ids:
-                c.member_ids.remove(participant.id)
+        self._leave_clusters(participant.id)
 
         # Add to new cluster
         cluster.member_ids.append(participant.id)
+        self._members[cluster.id].add(participant.id)
         participant.cluster_id = cluster.id
         self.save()
 
     def remove_from_cluster(self, cluster_name: str, participant_name: str) -> None:
         """Remove a participant from a cluster."""
-        data = self.load()
-        cluster = self.get_cluster_by_name(cluster_name)
-        participant = self.get_participant_by_name(participant_name)
+        self.load()
+        cluster = self._c_by_name.get(cluster_name.lower())
+        participant = self._p_by_name.get(participant_name.lower())
 
         if cluster is None:
             raise ValueError(f"Cluster '{cluster_name}' not found")
         if participant is None:
             raise ValueError(f"Participant '{participant_name}' not found")
-        if participant.id not in cluster.member_ids:
+        members = self._members[cluster.id]
+        if participant.id not in members:
             raise ValueError(f"'{participant_name}' is not in cluster '{cluster_name}'")
 
         cluster.member_ids.remove(participant.id)
+        members.discard(participant.id)
         participant.cluster_id = None
         self.save()
 
     def remove_cluster(self, name: str) -> bool:
         """Remove a cluster by name and clear participant references."""
         data = self.load()
-        cluster = self.get_cluster_by_name(name)
+        name_lower = name.lower()
+        cluster = self._c_by_name.get(name_lower)
         if cluster is None:
             return False
         
@@ -188,9 +363,23 @@ class Storage:
                 p.cluster_id = None
         
         data.clusters = [c for c in data.clusters if c.id != cluster.id]
+        self._members.pop(cluster.id, None)
+        del self._c_by_name[name_lower]
+        for other in data.clusters:
+            if other.name.lower() == name_lower:
+                self._c_by_name[name_lower] = other
+                break
         self.save()
         return True
 
+    def _leave_clusters(self, participant_id: UUID) -> None:
+        """Drop a participant from every cluster that lists them (data must be loaded)."""
+        for c in self._data.clusters:
+            members = self._members[c.id]
+            if participant_id in members:
+                c.member_ids.remove(participant_id)
+                members.discard(participant_id)
+
     def list_clusters(self) -> list[Cluster]:
         """Get all clusters."""
         return self.load().clusters
@@ -200,6 +389,7 @@ class Storage:
         """Save new assignments, replacing any existing ones."""
         data = self.load()
         data.assignments = assignments
+        self._a_by_giver = {a.giver_id: a for a in assignments}
         self.save()
 
     def get_assignments(self) -> list[Assignment]:
@@ -208,11 +398,21 @@ class Storage:
 
     def mark_email_sent(self, giver_id: UUID) -> None:
         """Mark an assignment's email as sent."""
-        data = self.load()
-        for a in data.assignments:
-            if a.giver_id == giver_id:
+        self.load()
+        a = self._a_by_giver.get(giver_id)
+        if a is not None:
+            a.email_sent = True
+        self.save()
+
+    def mark_emails_sent(self, giver_ids: list[UUID]) -> None:
+        """Mark several assignments' emails as sent with a single write."""
+        if not giver_ids:
+            return
+        self.load()
+        for giver_id in giver_ids:
+            a = self._a_by_giver.get(giver_id)
+            if a is not None:
                 a.email_sent = True
-                break
         self.save()
 
     # Config operations
@@ -222,11 +422,11 @@ class Storage:
         If config is not set in storage, tries to load from .env file.
         Environment variables: BREVO_API_KEY, SENDER_EMAIL, SENDER_NAME
         """
-        import os
-        from dotenv import load_dotenv
+        if self._config is not None:
+            return self._config
         
         # Load .env file from current directory or project root
-        load_dotenv()
+        self._load_env()
         
         config = self.load().config
         
@@ -240,10 +440,24 @@ class Storage:
             if env_name:
                 config.sender_name = env_name
         
+        self._config = config
         return config
 
+    def invalidate_config(self) -> None:
+        """Drop the cached config so the next get_config() rebuilds it."""
+        self._config = None
+
+    def _load_env(self) -> None:
+        """Load the .env file once; later calls reuse the populated environment."""
+        if self._env_loaded:
+            return
+        from dotenv import load_dotenv
+        load_dotenv()
+        self._env_loaded = True
+
     def save_config(self, config: Config) -> None:
         """Save application config."""
         data = self.load()
         data.config = config
+        self.invalidate_config()
         self.save()
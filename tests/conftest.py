@@ -0,0 +1,23 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from secret_santa.models import Participant
+
+
+@pytest.fixture(scope="session")
+def kids():
+    """Four unclustered kids, Kid1..Kid4. Shared across tests, so never mutate them."""
+    return tuple(
+        Participant(name=f"Kid{i}", email=f"kid{i}@test.com", is_kid=True)
+        for i in range(1, 5)
+    )
+
+
+@pytest.fixture(scope="session")
+def adults():
+    """Four unclustered adults, Adult1..Adult4. Shared across tests, so never mutate them."""
+    return tuple(
+        Participant(name=f"Adult{i}", email=f"adult{i}@test.com", is_kid=False)
+        for i in range(1, 5)
+    )
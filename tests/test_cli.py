@@ -17,9 +17,9 @@ def temp_storage(tmp_path):
 @pytest.fixture
 def cli_runner(temp_storage, monkeypatch):
     """Create a CLI runner with temporary storage."""
-    # Monkeypatch the global storage in cli module
-    import secret_santa.cli as cli_module
-    monkeypatch.setattr(cli_module, 'storage', temp_storage)
+    # Monkeypatch the global storage used by the command implementations
+    import secret_santa._cli_impl as cli_impl
+    monkeypatch.setattr(cli_impl, 'storage', temp_storage)
     return CliRunner()
 
 
@@ -116,3 +116,296 @@ class TestCombinedFlags:
         assert result.exit_code == 0
         assert "KID" in result.output
         assert "cluster" in result.output.lower() or "Johnson Family" in result.output
+
+
+class TestPlainOutput:
+    """Tests for plain output when stdout is not a terminal."""
+    
+    def test_list_prints_tab_separated_rows(self, cli_runner):
+        """santa list should print one tab-separated line per participant when piped."""
+        cli_runner.invoke(cli, ['add', 'John', 'john@test.com', '--cluster', 'Smith Family'])
+        cli_runner.invoke(cli, ['add', 'Tommy', 'parent@test.com', '--kid'])
+        
+        result = cli_runner.invoke(cli, ['list'])
+        
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [
+            "1\tJohn\tjohn@test.com\t-\t-\tSmith Family",
+            "2\tTommy\tparent@test.com\t✓\t-\t-",
+        ]
+    
+    def test_clusters_prints_tab_separated_rows(self, cli_runner):
+        """santa clusters should print name, member count and members when piped."""
+        cli_runner.invoke(cli, ['add', 'John', 'john@test.com', '--cluster', 'Smith Family'])
+        cli_runner.invoke(cli, ['add', 'Jane', 'jane@test.com', '--cluster', 'Smith Family'])
+        
+        result = cli_runner.invoke(cli, ['clusters'])
+        
+        assert result.exit_code == 0
+        assert result.output.splitlines() == ["Smith Family\t2\tJohn, Jane"]
+
+
+class TestErrors:
+    """Tests for command error reporting."""
+    
+    def test_duplicate_email_fails(self, cli_runner):
+        """Adding the same adult email twice should exit with an error."""
+        cli_runner.invoke(cli, ['add', 'John', 'john@test.com'])
+        
+        result = cli_runner.invoke(cli, ['add', 'Johnny', 'john@test.com'])
+        
+        assert result.exit_code == 1
+        assert "Error: Participant with email john@test.com already exists" in result.output
+    
+    def test_kick_from_missing_cluster_fails(self, cli_runner):
+        """Kicking someone from a cluster that doesn't exist should exit with an error."""
+        result = cli_runner.invoke(cli, ['cluster', 'kick', 'Nobody', 'John'])
+        
+        assert result.exit_code == 1
+        assert "Cluster 'Nobody' not found" in result.output
+    
+    def test_invalid_email_fails(self, cli_runner, temp_storage):
+        """A malformed participant email should be rejected before it is stored."""
+        result = cli_runner.invoke(cli, ['add', 'John', 'not-an-email'])
+        
+        assert result.exit_code == 1
+        assert "Invalid email address 'not-an-email'" in result.output
+        assert temp_storage.list_participants() == []
+    
+    def test_invalid_sender_email_fails(self, cli_runner, temp_storage):
+        """A malformed sender email should not be saved to the config."""
+        result = cli_runner.invoke(cli, ['config', '--sender-email', 'santa@'])
+        
+        assert result.exit_code == 1
+        assert "Invalid email address 'santa@'" in result.output
+        assert temp_storage.load().config.sender_email is None
+
+
+class TestBulkAdd:
+    """Tests for the 'santa bulk-add' command."""
+    
+    def test_bulk_add_from_csv(self, cli_runner, temp_storage, tmp_path):
+        """Every valid CSV row should become a participant."""
+        csv_file = tmp_path / "people.csv"
+        csv_file.write_text(
+            "name,email,parent_email,kid,cluster\n"
+            "John,john@test.com,,,Smith Family\n"
+            "Tommy,parent@test.com,,yes,Smith Family\n"
+            "Alice,alice@test.com,,,\n",
+            encoding="utf-8",
+        )
+        
+        result = cli_runner.invoke(cli, ['bulk-add', str(csv_file)])
+        
+        assert result.exit_code == 0
+        assert "Added 3 participant(s)" in result.output
+        participants = {p.name: p for p in temp_storage.list_participants()}
+        assert set(participants) == {"John", "Tommy", "Alice"}
+        assert participants["Tommy"].is_kid
+        cluster = temp_storage.get_cluster_by_name("Smith Family")
+        assert cluster.member_ids == [participants["John"].id, participants["Tommy"].id]
+    
+    def test_bulk_add_skips_bad_rows(self, cli_runner, temp_storage, tmp_path):
+        """Invalid rows should be reported and skipped without losing the rest."""
+        csv_file = tmp_path / "people.csv"
+        csv_file.write_text(
+            "name,email\n"
+            "John,john@test.com\n"
+            "Johnny,john@test.com\n"
+            "Alice,alice@test.com\n",
+            encoding="utf-8",
+        )
+        
+        result = cli_runner.invoke(cli, ['bulk-add', str(csv_file)])
+        
+        assert result.exit_code == 0
+        assert "Skipped line 3" in result.output
+        assert [p.name for p in temp_storage.list_participants()] == ["John", "Alice"]
+    
+    def test_bulk_add_skips_blank_names(self, cli_runner, temp_storage, tmp_path):
+        """A row with an empty name should be skipped like a bad email."""
+        csv_file = tmp_path / "people.csv"
+        csv_file.write_text(
+            "name,email\n"
+            "John,john@test.com\n"
+            "   ,nobody@test.com\n"
+            "Alice,alice@test.com\n",
+            encoding="utf-8",
+        )
+        
+        result = cli_runner.invoke(cli, ['bulk-add', str(csv_file)])
+        
+        assert result.exit_code == 0
+        assert "Skipped line 3" in result.output
+        assert "name is required" in result.output
+        assert [p.name for p in temp_storage.list_participants()] == ["John", "Alice"]
+    
+    def test_bulk_add_requires_name_and_email(self, cli_runner, tmp_path):
+        """A CSV without the required columns should be rejected."""
+        csv_file = tmp_path / "people.csv"
+        csv_file.write_text("name\nJohn\n", encoding="utf-8")
+        
+        result = cli_runner.invoke(cli, ['bulk-add', str(csv_file)])
+        
+        assert result.exit_code == 1
+        assert "email" in result.output
+
+
+class TestWelcomeScreen:
+    """Tests for running 'santa' with no subcommand."""
+    
+    def test_welcome_without_terminal_skips_art(self, cli_runner):
+        """Non-terminal output should get a plain banner instead of clear codes and art."""
+        result = cli_runner.invoke(cli, [])
+        
+        assert result.exit_code == 0
+        assert result.output.startswith("🎅 Secret Santa CLI")
+        assert "\x1b[" not in result.output
+        assert "Quick Reference" in result.output
+
+
+class TestLazySubcommands:
+    """Tests for resolving subcommands on demand."""
+    
+    def test_all_commands_are_listed(self, cli_runner):
+        """Every lazily declared command should appear in --help."""
+        from secret_santa.cli import LAZY_SUBCOMMANDS
+        
+        result = cli_runner.invoke(cli, ['--help'])
+        
+        assert result.exit_code == 0
+        for name in LAZY_SUBCOMMANDS:
+            assert name in result.output
+    
+    def test_lazy_paths_resolve_to_named_commands(self):
+        """Each lazy path should import a click command with the mapped name."""
+        import click
+        from secret_santa.cli import LAZY_SUBCOMMANDS
+        
+        ctx = click.Context(cli)
+        for name in LAZY_SUBCOMMANDS:
+            command = cli.get_command(ctx, name)
+            assert isinstance(command, click.Command)
+            assert command.name == name
+    
+    def test_unknown_command_fails(self, cli_runner):
+        """An unknown subcommand should still be rejected by click."""
+        result = cli_runner.invoke(cli, ['nope'])
+        
+        assert result.exit_code != 0
+        assert "No such command" in result.output
+
+
+class TestFastPaths:
+    """Tests that --help and --version don't pay for Rich or storage."""
+    
+    @pytest.mark.parametrize("args", [["--version"], ["--help"], ["send", "--help"]])
+    def test_no_heavy_imports(self, args):
+        """Rich, pydantic and the storage layer should not be imported."""
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys\n"
+            "from secret_santa.cli import cli\n"
+            f"try:\n    cli({args!r})\nexcept SystemExit:\n    pass\n"
+            "heavy = ['rich', 'pydantic', 'secret_santa.storage', 'secret_santa._cli_impl']\n"
+            "print('heavy:', ','.join(m for m in heavy if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, encoding="utf-8",
+            cwd=Path(__file__).resolve().parent.parent,
+        )
+        
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "heavy:"
+
+
+class TestAssignCommand:
+    """Tests for the 'santa assign' command."""
+    
+    def test_assign_prints_codes_for_everyone(self, cli_runner):
+        """Every participant should be listed with a verification code."""
+        for name in ["Alice", "Bob", "Charlie"]:
+            cli_runner.invoke(cli, ['add', name, f'{name.lower()}@test.com'])
+        
+        result = cli_runner.invoke(cli, ['assign'])
+        
+        assert result.exit_code == 0
+        assert "Assignments generated" in result.output
+        for name in ["Alice", "Bob", "Charlie"]:
+            assert any(line.startswith(f"{name}\t") for line in result.output.splitlines())
+    
+    def test_assign_streams_rows_for_large_groups_on_terminal(self, cli_runner, monkeypatch):
+        """Past the table limit, a terminal should get one line per assignment."""
+        import io
+        from rich.console import Console
+        import secret_santa._cli_impl as cli_impl
+        
+        for name in ["Alice", "Bob", "Charlie"]:
+            cli_runner.invoke(cli, ['add', name, f'{name.lower()}@test.com'])
+        out = io.StringIO()
+        monkeypatch.setattr(cli_impl, 'console', Console(file=out, force_terminal=True, no_color=True, width=80))
+        monkeypatch.setattr(cli_impl, '_TABLE_MAX_ROWS', 2)
+        
+        result = cli_runner.invoke(cli, ['assign'])
+        
+        assert result.exit_code == 0
+        lines = out.getvalue().splitlines()
+        for name in ["Alice", "Bob", "Charlie"]:
+            assert any(line.startswith(f"  ✓ {name}  ") for line in lines)
+        assert "Verification Code" not in out.getvalue()
+    
+    def test_assign_needs_two_participants(self, cli_runner):
+        """Assigning with a single participant should fail."""
+        cli_runner.invoke(cli, ['add', 'Alice', 'alice@test.com'])
+        
+        result = cli_runner.invoke(cli, ['assign'])
+        
+        assert result.exit_code == 1
+        assert "at least 2 participants" in result.output
+
+
+class TestSendCommand:
+    """Tests for the 'santa send' command."""
+    
+    def test_sent_flags_survive_a_failed_run(self, cli_runner, temp_storage, monkeypatch):
+        """Emails sent before a failure should stay marked as sent."""
+        from secret_santa import email
+        
+        for i in range(15):
+            cli_runner.invoke(cli, ['add', f'Person{i}', f'person{i}@test.com'])
+        cli_runner.invoke(cli, ['assign'])
+        cli_runner.invoke(cli, ['config', '--api-key', 'key', '--sender-email', 'santa@test.com'])
+        
+        def fake_send_all(assignments, config, dry_run=False, on_progress=None, workers=8):
+            for assignment in assignments[:12]:
+                on_progress(assignment, {"status": "sent"})
+            raise email.EmailError("connection lost")
+        
+        monkeypatch.setattr(email, "send_all_assignments", fake_send_all)
+        
+        result = cli_runner.invoke(cli, ['send'])
+        
+        assert result.exit_code == 1
+        reloaded = Storage(data_dir=temp_storage.data_dir)
+        assert sum(a.email_sent for a in reloaded.get_assignments()) == 12
+
+
+class TestExportCommand:
+    """Tests for the 'santa export' command."""
+    
+    def test_export_writes_indented_json(self, cli_runner, temp_storage, tmp_path):
+        """The export should be readable, while the data file stays compact."""
+        import json
+        
+        cli_runner.invoke(cli, ['add', 'Alice', 'alice@test.com'])
+        output = tmp_path / "export.json"
+        
+        result = cli_runner.invoke(cli, ['export', str(output)])
+        
+        assert result.exit_code == 0
+        text = output.read_text(encoding="utf-8")
+        assert '\n  "participants": [' in text
+        assert json.loads(text)["participants"][0]["name"] == "Alice"
+        assert "\n" not in temp_storage.data_file.read_text(encoding="utf-8")
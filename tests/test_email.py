@@ -1,8 +1,15 @@
 """Tests for email functionality."""
 
+import time
+from types import SimpleNamespace
+from uuid import UUID
+
 import pytest
+from sib_api_v3_sdk.rest import ApiException
 
-from secret_santa.email import create_email_html
+from secret_santa import email
+from secret_santa.email import RateLimiter, _send_batch, create_email_html, send_all_assignments
+from secret_santa.models import Assignment, Config
 
 
 class TestEmailContent:
@@ -61,6 +68,13 @@ class TestEmailContent:
         
         assert "secret" in html.lower()
     
+    def test_email_html_is_cached_per_input(self):
+        """Identical inputs should reuse the rendered HTML; a new limit should not."""
+        html = create_email_html("Jane", 25, "AB12")
+        
+        assert create_email_html("Jane", 25, "AB12") is html
+        assert "$30" in create_email_html("Jane", 30, "AB12")
+    
     def test_default_gift_limit_is_25(self):
         """Default gift limit should be $25."""
         html = create_email_html("Test")
@@ -163,3 +177,206 @@ class TestKidParentEmail:
         assert "<html>" in html
         assert "</html>" in html
 
+
+class TestSendAllAssignments:
+    """Tests for sending a batch of assignment emails."""
+    
+    @staticmethod
+    def _assignment(i, email_sent=False):
+        return Assignment(
+            giver_id=UUID(int=2 * i + 1),
+            receiver_id=UUID(int=2 * i + 2),
+            giver_name=f"Giver{i}",
+            receiver_name=f"Receiver{i}",
+            giver_email=f"giver{i}@test.com",
+            receiver_email=f"receiver{i}@test.com",
+            email_sent=email_sent,
+        )
+    
+    @staticmethod
+    def _use_api(monkeypatch, api):
+        """Make send_all_assignments send through api instead of Brevo."""
+        monkeypatch.setattr(email, "_create_api", lambda config, pool_size=1: api)
+        monkeypatch.setattr(email, "_close_api", lambda api_instance: None)
+    
+    def test_results_keep_assignment_order(self, monkeypatch):
+        """Batches finishing out of order should still give results in assignment order."""
+        monkeypatch.setattr(email, "MAX_MESSAGE_VERSIONS", 2)
+        assignments = [self._assignment(i) for i in range(20)]
+        index_of = {a.giver_email: i for i, a in enumerate(assignments)}
+        # Earlier batches take longer, so they finish after later ones
+        api = TestBatchSend.FakeApi(
+            delay=lambda payload: 0.01 * (20 - index_of[payload.message_versions[0].to[0]["email"]])
+        )
+        self._use_api(monkeypatch, api)
+        config = Config(brevo_api_key="key", sender_email="santa@test.com")
+        progress = []
+        
+        results = send_all_assignments(
+            assignments, config, workers=4, rate_limit=None,
+            on_progress=lambda a, r: progress.append(a.giver_name)
+        )
+        
+        assert len(api.calls) == 10
+        assert [r["giver"] for r in results] == [a.giver_name for a in assignments]
+        assert all(r["status"] == "sent" for r in results)
+        assert sorted(progress) == sorted(a.giver_name for a in assignments)
+        assert progress != [a.giver_name for a in assignments]
+    
+    def test_rejected_recipient_only_fails_own_email(self, monkeypatch):
+        """A batch Brevo rejects should be split until only the bad email fails."""
+        api = TestBatchSend.FakeApi(reject={"giver3@test.com"})
+        self._use_api(monkeypatch, api)
+        assignments = [self._assignment(i) for i in range(8)]
+        config = Config(brevo_api_key="key", sender_email="santa@test.com")
+        progress = []
+        
+        results = send_all_assignments(
+            assignments, config, rate_limit=None,
+            on_progress=lambda a, r: progress.append(a.giver_name)
+        )
+        
+        assert [r["status"] for r in results] == ["sent"] * 3 + ["error"] + ["sent"] * 4
+        assert "400" in results[3]["error"]
+        assert sorted(progress) == sorted(a.giver_name for a in assignments if a.giver_name != "Giver3")
+    
+    def test_auth_error_fails_batch_without_splitting(self, monkeypatch):
+        """An authentication error would fail every retry, so the batch fails once."""
+        api = TestBatchSend.FakeApi(reject={"giver0@test.com"}, status=401)
+        self._use_api(monkeypatch, api)
+        assignments = [self._assignment(i) for i in range(4)]
+        config = Config(brevo_api_key="key", sender_email="santa@test.com")
+        
+        results = send_all_assignments(assignments, config, rate_limit=None)
+        
+        assert len(api.calls) == 1
+        assert all(r["status"] == "error" for r in results)
+    
+    def test_dry_run_keeps_assignment_order(self):
+        """Dry runs should return a would_send result per assignment, in order."""
+        assignments = [self._assignment(i) for i in range(20)]
+        config = Config(brevo_api_key="key", sender_email="santa@test.com")
+        
+        results = send_all_assignments(assignments, config, dry_run=True, workers=4)
+        
+        assert [r["giver"] for r in results] == [a.giver_name for a in assignments]
+        assert all(r["status"] == "would_send" for r in results)
+    
+    def test_already_sent_is_skipped(self):
+        """Assignments already emailed should not be sent again."""
+        assignments = [self._assignment(0, email_sent=True), self._assignment(1)]
+        # No sender email, so the pending send fails before touching the network
+        config = Config(brevo_api_key="key")
+        progress = []
+        
+        results = send_all_assignments(
+            assignments, config, on_progress=lambda a, r: progress.append(a.giver_name)
+        )
+        
+        assert results[0]["status"] == "already_sent"
+        assert results[1]["status"] == "error"
+        assert progress == []
+
+
+class TestBatchSend:
+    """Tests for sending assignments through Brevo message versions."""
+    
+    class FakeApi:
+        """
+        Records payloads instead of calling Brevo.
+        
+        Payloads addressed to any email in reject fail with an ApiException
+        of the given status. delay(payload) gives seconds to wait before
+        replying, and short_by drops that many ids from each reply.
+        """
+        
+        def __init__(self, reject=(), status=400, delay=None, short_by=0):
+            self.calls = []
+            self.reject = set(reject)
+            self.status = status
+            self.delay = delay
+            self.short_by = short_by
+        
+        def send_transac_email(self, payload):
+            self.calls.append(payload)
+            if self.delay:
+                time.sleep(self.delay(payload))
+            emails = {to["email"] for version in payload.message_versions for to in version.to}
+            if emails & self.reject:
+                raise ApiException(status=self.status, reason="Rejected")
+            ids = [f"<id{i}>" for i in range(len(payload.message_versions) - self.short_by)]
+            return SimpleNamespace(message_id=None, message_ids=ids)
+    
+    def test_batches_split_by_template_and_size(self, monkeypatch):
+        """Kid and adult emails go in separate batches, capped in size."""
+        monkeypatch.setattr(email, "MAX_MESSAGE_VERSIONS", 2)
+        assignments = [TestSendAllAssignments._assignment(i) for i in range(5)]
+        assignments[1].is_kid = True
+        
+        batches = email._batch_indices(assignments, list(range(5)))
+        
+        assert batches == [[0, 2], [3, 4], [1]]
+    
+    def test_batch_uses_one_call_with_params(self):
+        """A batch should be one API call with per-recipient params."""
+        assignments = [TestSendAllAssignments._assignment(i) for i in range(3)]
+        config = Config(brevo_api_key="key", sender_email="santa@test.com")
+        api = self.FakeApi()
+        
+        results = _send_batch(api, assignments, config)
+        
+        assert len(api.calls) == 1
+        payload = api.calls[0]
+        assert "{{ params.receiver_name }}" in payload.html_content
+        assert [v.params["receiver_name"] for v in payload.message_versions] == [
+            "Receiver0", "Receiver1", "Receiver2"
+        ]
+        assert [r["message_id"] for r in results] == ["<id0>", "<id1>", "<id2>"]
+        assert all(r["status"] == "sent" for r in results)
+    
+    def test_batch_uses_configured_template(self):
+        """With a Brevo template configured, only params should be sent."""
+        assignments = [TestSendAllAssignments._assignment(i) for i in range(2)]
+        config = Config(brevo_api_key="key", sender_email="santa@test.com", template_id=7, gift_limit=40)
+        api = self.FakeApi()
+        
+        _send_batch(api, assignments, config)
+        
+        payload = api.calls[0]
+        assert payload.template_id == 7
+        assert payload.html_content is None
+        assert payload.message_versions[0].params["gift_limit"] == 40
+    
+    def test_missing_message_ids_are_not_marked_sent(self):
+        """If Brevo returns too few ids, no email in the batch should count as sent."""
+        assignments = [TestSendAllAssignments._assignment(i) for i in range(3)]
+        config = Config(brevo_api_key="key", sender_email="santa@test.com")
+        
+        results = _send_batch(self.FakeApi(short_by=1), assignments, config)
+        
+        assert all(r["status"] == "unknown" for r in results)
+        assert "2 message ids for 3 emails" in results[0]["error"]
+
+
+class TestRateLimiter:
+    """Tests for the API call token bucket."""
+    
+    def test_waits_once_bucket_is_empty(self):
+        """Calls past the burst capacity should wait for a refill."""
+        now = [0.0]
+        sleeps = []
+        
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+        
+        limiter = RateLimiter(2.0, clock=lambda: now[0], sleep=sleep)
+        for _ in range(3):
+            limiter.acquire()
+        
+        assert sleeps == [pytest.approx(0.5)]
+    
+    def test_rejects_non_positive_rate(self):
+        """A zero rate would block forever."""
+        with pytest.raises(ValueError):
+            RateLimiter(0)
@@ -1,15 +1,27 @@
 """Tests for the matchmaking algorithm."""
 
+import random
+from collections import Counter
+from itertools import permutations
+
 import pytest
-from uuid import uuid4
+from uuid import UUID
 
 from secret_santa.models import Participant, Cluster, SecretSantaData
-from secret_santa.matcher import create_assignments, MatcherError, _same_cluster, generate_verification_code
+from secret_santa import matcher
+from secret_santa.matcher import (
+    create_assignments,
+    MatcherError,
+    _build_candidates,
+    generate_verification_code,
+)
 
 
 class MockStorage:
     """Mock storage for testing."""
     
+    __slots__ = ("participants", "clusters")
+    
     def __init__(self, participants: list[Participant] = None, clusters: list[Cluster] = None):
         self.participants = participants or []
         self.clusters = clusters or []
@@ -21,35 +33,245 @@ class MockStorage:
         return self.clusters
 
 
-class TestSameCluster:
-    """Tests for the _same_cluster helper function."""
-    
-    def test_both_no_cluster(self):
-        """Two participants without clusters are not in the same cluster."""
-        id1, id2 = uuid4(), uuid4()
-        cluster_map = {id1: None, id2: None}
-        assert _same_cluster(id1, id2, cluster_map) is False
-    
-    def test_one_no_cluster(self):
-        """One participant without cluster is not in same cluster as one with cluster."""
-        id1, id2 = uuid4(), uuid4()
-        cluster_id = uuid4()
-        cluster_map = {id1: None, id2: cluster_id}
-        assert _same_cluster(id1, id2, cluster_map) is False
+# Seeds for the randomized tests; each one is collected as its own case
+SEEDS = range(50)
+STRESS_SEEDS = range(100)
+
+
+@pytest.fixture(scope="module")
+def ten_people():
+    """Ten people with no clusters."""
+    return MockStorage([
+        Participant(name=f"Person{i}", email=f"p{i}@test.com")
+        for i in range(10)
+    ])
+
+
+@pytest.fixture(scope="module")
+def three_people():
+    """Three people with no clusters, who have exactly two possible gift circles."""
+    return MockStorage([
+        Participant(name=f"Person{i}", email=f"p{i}@test.com")
+        for i in range(3)
+    ])
+
+
+@pytest.fixture(scope="module")
+def one_family():
+    """Alice and Bob share a cluster; Charlie and Diana are unclustered."""
+    cluster = Cluster(name="Family")
+    alice = Participant(name="Alice", email="alice@test.com", cluster_id=cluster.id)
+    bob = Participant(name="Bob", email="bob@test.com", cluster_id=cluster.id)
+    charlie = Participant(name="Charlie", email="charlie@test.com")
+    diana = Participant(name="Diana", email="diana@test.com")
+    cluster.member_ids = [alice.id, bob.id]
+    return MockStorage([alice, bob, charlie, diana], [cluster])
+
+
+@pytest.fixture(scope="module")
+def two_families():
+    """Two families of 2, plus 2 unclustered."""
+    cluster1 = Cluster(name="Family1")
+    cluster2 = Cluster(name="Family2")
+    participants = [
+        Participant(name=f"P{i}", email=f"p{i}@test.com", cluster_id=cluster.id if cluster else None)
+        for i, cluster in enumerate([cluster1, cluster1, cluster2, cluster2, None, None], start=1)
+    ]
+    cluster1.member_ids = [p.id for p in participants[:2]]
+    cluster2.member_ids = [p.id for p in participants[2:4]]
+    return MockStorage(participants, [cluster1, cluster2])
+
+
+@pytest.fixture(scope="module")
+def three_kids_three_adults(kids, adults):
+    """Three kids and three adults."""
+    return MockStorage([*kids[:3], *adults[:3]])
+
+
+@pytest.fixture(scope="module")
+def two_kids_two_adults(kids, adults):
+    """Two kids and two adults."""
+    return MockStorage([*kids[:2], *adults[:2]])
+
+
+@pytest.fixture(scope="module")
+def sibling_kids():
+    """Four kids, the first two of which are siblings."""
+    cluster = Cluster(name="Siblings")
+    kids = [
+        Participant(name=f"Kid{i}", email=f"kid{i}@test.com", is_kid=True, cluster_id=cluster.id if i < 3 else None)
+        for i in range(1, 5)
+    ]
+    cluster.member_ids = [kids[0].id, kids[1].id]
+    return MockStorage(kids, [cluster])
+
+
+@pytest.fixture(scope="module")
+def family_and_friends():
+    """A family of 4 plus 4 unclustered others."""
+    cluster = Cluster(name="Family")
+    family_members = [
+        Participant(name=f"Family{i}", email=f"fam{i}@test.com", cluster_id=cluster.id)
+        for i in range(4)
+    ]
+    others = [
+        Participant(name=f"Other{i}", email=f"other{i}@test.com")
+        for i in range(4)
+    ]
+    cluster.member_ids = [p.id for p in family_members]
+    return MockStorage(family_members + others, [cluster])
+
+
+@pytest.fixture(scope="module")
+def two_big_families():
+    """Two families of 5 plus 10 independent participants."""
+    cluster1 = Cluster(name="Big Family 1")
+    cluster2 = Cluster(name="Big Family 2")
+    family1 = [
+        Participant(name=f"Fam1_{i}", email=f"fam1_{i}@test.com", cluster_id=cluster1.id)
+        for i in range(5)
+    ]
+    family2 = [
+        Participant(name=f"Fam2_{i}", email=f"fam2_{i}@test.com", cluster_id=cluster2.id)
+        for i in range(5)
+    ]
+    independents = [
+        Participant(name=f"Ind_{i}", email=f"ind_{i}@test.com")
+        for i in range(10)
+    ]
+    cluster1.member_ids = [p.id for p in family1]
+    cluster2.member_ids = [p.id for p in family2]
+    return MockStorage(family1 + family2 + independents, [cluster1, cluster2])
+
+
+@pytest.fixture(scope="module")
+def mixed_family():
+    """A family of 2 kids and 2 adults, plus 2 kids and 2 adults outside it."""
+    cluster = Cluster(name="Family")
+    family = [
+        *(Participant(name=f"FamKid{i}", email=f"famkid{i}@test.com", cluster_id=cluster.id, is_kid=True)
+          for i in range(2)),
+        *(Participant(name=f"FamAdult{i}", email=f"famadult{i}@test.com", cluster_id=cluster.id, is_kid=False)
+          for i in range(2)),
+    ]
+    others = [
+        *(Participant(name=f"OtherKid{i}", email=f"otherkid{i}@test.com", is_kid=True) for i in range(2)),
+        *(Participant(name=f"OtherAdult{i}", email=f"otheradult{i}@test.com", is_kid=False) for i in range(2)),
+    ]
+    cluster.member_ids = [p.id for p in family]
+    return MockStorage(family + others, [cluster])
+
+
+def _kid_ids(storage):
+    return {p.id for p in storage.participants if p.is_kid}
+
+
+def _givers_and_receivers(assignments):
+    """Sets of giver and receiver ids, collected in one pass."""
+    givers, receivers = set(), set()
+    for a in assignments:
+        givers.add(a.giver_id)
+        receivers.add(a.receiver_id)
+    return givers, receivers
+
+
+def _same_cluster(p1, p2):
+    """Reference pairwise cluster check for the oracles below."""
+    # If either has no cluster, they're not in the same cluster
+    return p1.cluster_id is not None and p1.cluster_id == p2.cluster_id
+
+
+def _valid_circles(storage, separate_kids=False):
+    """Every set of (giver, receiver) id pairs the rules allow, by brute force.
+    
+    Ids are kept as UUID.int, which hashes and compares without going through
+    UUID's Python-level __hash__ and __eq__.
+    """
+    people = storage.participants
+    ids = [p.id.int for p in people]
+    # Check the rules once per pair, not once per pair per permutation
+    allowed = [
+        frozenset(
+            j for j, receiver in enumerate(people)
+            if i != j
+            and not _same_cluster(giver, receiver)
+            and (not separate_kids or giver.is_kid == receiver.is_kid)
+        )
+        for i, giver in enumerate(people)
+    ]
+    return {
+        frozenset(zip(ids, (ids[j] for j in order)))
+        for order in permutations(range(len(people)))
+        if all(j in allowed[i] for i, j in enumerate(order))
+    }
+
+
+def _assert_reaches_every_valid_circle(storage, separate_kids=False, max_runs=1000):
+    """Seeded runs must only produce valid circles, and eventually all of them."""
+    valid = _valid_circles(storage, separate_kids)
+    seen = set()
+    for seed in range(max_runs):
+        random.seed(seed)
+        assignments = create_assignments(storage, separate_kids=separate_kids)
+        circle = frozenset((a.giver_id.int, a.receiver_id.int) for a in assignments)
+        assert circle in valid, f"Seed {seed} produced an assignment the rules forbid"
+        seen.add(circle)
+        if seen == valid:
+            return
+    pytest.fail(f"Only {len(seen)} of {len(valid)} valid assignments came up in {max_runs} runs")
+
+
+class TestBuildCandidates:
+    """Tests for the allowed-receiver bitmasks."""
     
-    def test_same_cluster(self):
-        """Two participants in the same cluster are detected."""
-        id1, id2 = uuid4(), uuid4()
-        cluster_id = uuid4()
-        cluster_map = {id1: cluster_id, id2: cluster_id}
-        assert _same_cluster(id1, id2, cluster_map) is True
+    def test_excludes_self_and_cluster(self):
+        """A giver's mask should exclude themselves and their cluster."""
+        cluster = Cluster(name="Family")
+        alice = Participant(name="Alice", email="alice@test.com", cluster_id=cluster.id)
+        bob = Participant(name="Bob", email="bob@test.com", cluster_id=cluster.id)
+        charlie = Participant(name="Charlie", email="charlie@test.com")
+        
+        candidates = _build_candidates([alice, bob, charlie], separate_kids=False)
+        
+        assert candidates == [0b100, 0b100, 0b011]
     
-    def test_different_clusters(self):
-        """Two participants in different clusters are not in same cluster."""
-        id1, id2 = uuid4(), uuid4()
-        cluster_id1, cluster_id2 = uuid4(), uuid4()
-        cluster_map = {id1: cluster_id1, id2: cluster_id2}
-        assert _same_cluster(id1, id2, cluster_map) is False
+    def test_separate_kids_limits_bucket(self):
+        """With separate_kids, kids should only be able to pick kids."""
+        kid1 = Participant(name="Kid1", email="kid1@test.com", is_kid=True)
+        adult = Participant(name="Adult", email="adult@test.com")
+        kid2 = Participant(name="Kid2", email="kid2@test.com", is_kid=True)
+        
+        candidates = _build_candidates([kid1, adult, kid2], separate_kids=True)
+        
+        assert candidates == [0b100, 0b000, 0b001]
+    
+    # Labels stand in for cluster ids; None means no cluster
+    @pytest.mark.parametrize("c1,c2,same", [
+        pytest.param(None, None, False, id="both_no_cluster"),
+        pytest.param(None, "x", False, id="first_no_cluster"),
+        pytest.param("x", None, False, id="second_no_cluster"),
+        pytest.param("x", "x", True, id="same_cluster"),
+        pytest.param("x", "y", False, id="different_clusters"),
+    ])
+    def test_cluster_pairs(self, c1, c2, same):
+        """Only two participants sharing a real cluster should be kept apart."""
+        cluster_ids = {None: None, "x": UUID(int=1), "y": UUID(int=2)}
+        p1, p2 = (
+            Participant(name="Person", email="person@test.com", cluster_id=cluster_ids[c])
+            for c in (c1, c2)
+        )
+        assert _same_cluster(p1, p2) is same
+        assert _build_candidates([p1, p2], separate_kids=False) == ([0b00, 0b00] if same else [0b10, 0b01])
+    
+    def test_agrees_with_same_cluster(self, two_families):
+        """Every pair's bit should match the pairwise _same_cluster check."""
+        participants = two_families.participants
+        candidates = _build_candidates(participants, separate_kids=False)
+        
+        for i, giver in enumerate(participants):
+            for j, receiver in enumerate(participants):
+                allowed = i != j and not _same_cluster(giver, receiver)
+                assert bool(candidates[i] >> j & 1) == allowed
 
 
 class TestCreateAssignments:
@@ -63,62 +285,39 @@ class TestCreateAssignments:
         with pytest.raises(MatcherError, match="at least 2 participants"):
             create_assignments(storage)
     
-    def test_no_self_assignment(self):
+    def test_options_are_keyword_only(self, ten_people):
+        """A positional attempt count must not be taken as swap rounds."""
+        with pytest.raises(TypeError):
+            create_assignments(ten_people, 1000)
+    
+    def test_max_attempts_zero_uses_fallback(self, one_family):
+        """With no uniform draws allowed, the matching fallback should still find valid circles."""
+        valid = _valid_circles(one_family)
+        for seed in SEEDS:
+            random.seed(seed)
+            assignments = create_assignments(one_family, max_attempts=0)
+            assert frozenset((a.giver_id.int, a.receiver_id.int) for a in assignments) in valid
+    
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_no_self_assignment(self, ten_people, seed):
         """No one should get themselves."""
-        participants = [
-            Participant(name=f"Person{i}", email=f"p{i}@test.com")
-            for i in range(10)
-        ]
-        storage = MockStorage(participants)
-        
-        # Run multiple times since it's random
-        for _ in range(50):
-            assignments = create_assignments(storage)
-            for a in assignments:
-                assert a.giver_id != a.receiver_id
+        random.seed(seed)
+        for a in create_assignments(ten_people):
+            assert a.giver_id != a.receiver_id
     
-    def test_everyone_gives_and_receives(self):
+    def test_everyone_gives_and_receives(self, ten_people):
         """Everyone should give exactly once and receive exactly once."""
-        participants = [
-            Participant(name=f"Person{i}", email=f"p{i}@test.com")
-            for i in range(10)
-        ]
-        storage = MockStorage(participants)
-        
-        assignments = create_assignments(storage)
+        assignments = create_assignments(ten_people)
         
-        givers = {a.giver_id for a in assignments}
-        receivers = {a.receiver_id for a in assignments}
-        participant_ids = {p.id for p in participants}
+        givers, receivers = _givers_and_receivers(assignments)
+        participant_ids = {p.id for p in ten_people.participants}
         
         assert givers == participant_ids
         assert receivers == participant_ids
     
-    def test_cluster_exclusion(self):
+    def test_cluster_exclusion(self, one_family):
         """Participants in the same cluster should never match."""
-        cluster = Cluster(name="Family")
-        
-        alice = Participant(name="Alice", email="alice@test.com", cluster_id=cluster.id)
-        bob = Participant(name="Bob", email="bob@test.com", cluster_id=cluster.id)
-        charlie = Participant(name="Charlie", email="charlie@test.com")
-        diana = Participant(name="Diana", email="diana@test.com")
-        
-        cluster.member_ids = [alice.id, bob.id]
-        
-        storage = MockStorage(
-            participants=[alice, bob, charlie, diana],
-            clusters=[cluster]
-        )
-        
-        # Run multiple times
-        for _ in range(50):
-            assignments = create_assignments(storage)
-            for a in assignments:
-                # If giver is Alice or Bob, receiver shouldn't be Bob or Alice
-                giver_in_cluster = a.giver_id in [alice.id, bob.id]
-                receiver_in_cluster = a.receiver_id in [alice.id, bob.id]
-                if giver_in_cluster:
-                    assert not receiver_in_cluster
+        _assert_reaches_every_valid_circle(one_family)
     
     def test_impossible_cluster_fails(self):
         """If a cluster has more than half of participants, it's impossible."""
@@ -136,38 +335,46 @@ class TestCreateAssignments:
         with pytest.raises(MatcherError, match="less than half"):
             create_assignments(storage)
     
-    def test_multiple_clusters(self):
-        """Multiple clusters should all be respected."""
-        cluster1 = Cluster(name="Family1")
-        cluster2 = Cluster(name="Family2")
-        
-        # 2 families of 2, plus 2 unclustered
-        p1 = Participant(name="P1", email="p1@test.com", cluster_id=cluster1.id)
-        p2 = Participant(name="P2", email="p2@test.com", cluster_id=cluster1.id)
-        p3 = Participant(name="P3", email="p3@test.com", cluster_id=cluster2.id)
-        p4 = Participant(name="P4", email="p4@test.com", cluster_id=cluster2.id)
-        p5 = Participant(name="P5", email="p5@test.com")
-        p6 = Participant(name="P6", email="p6@test.com")
-        
-        cluster1.member_ids = [p1.id, p2.id]
-        cluster2.member_ids = [p3.id, p4.id]
-        
-        storage = MockStorage(
-            participants=[p1, p2, p3, p4, p5, p6],
-            clusters=[cluster1, cluster2]
+    def test_tight_clusters_always_match(self):
+        """Two half-size clusters leave one valid shape, which should always be found."""
+        family1 = Cluster(name="Family1")
+        family2 = Cluster(name="Family2")
+        participants = [
+            Participant(name=f"Person{i}", email=f"p{i}@test.com", cluster_id=(family1 if i < 3 else family2).id)
+            for i in range(6)
+        ]
+        storage = MockStorage(participants, [family1, family2])
+        
+        _assert_reaches_every_valid_circle(storage)
+    
+    @pytest.mark.parametrize("roster,separate_kids", [
+        ("three_people", False),
+        ("three_kids_three_adults", True),
+    ])
+    @pytest.mark.parametrize("sample_attempts", [
+        pytest.param(matcher.SAMPLE_ATTEMPTS, id="sampled"),
+        pytest.param(0, id="fallback"),
+    ])
+    def test_assignments_are_uniform(self, request, monkeypatch, roster, separate_kids, sample_attempts):
+        """Every valid assignment should come up about equally often."""
+        storage = request.getfixturevalue(roster)
+        monkeypatch.setattr(matcher, "SAMPLE_ATTEMPTS", sample_attempts)
+        valid = _valid_circles(storage, separate_kids)
+        runs = 1000 * len(valid)
+        random.seed(0)
+        
+        counts = Counter(
+            frozenset((a.giver_id.int, a.receiver_id.int) for a in create_assignments(storage, separate_kids=separate_kids))
+            for _ in range(runs)
         )
         
-        # Run multiple times
-        for _ in range(50):
-            assignments = create_assignments(storage)
-            
-            for a in assignments:
-                # Check cluster1
-                if a.giver_id in [p1.id, p2.id]:
-                    assert a.receiver_id not in [p1.id, p2.id]
-                # Check cluster2
-                if a.giver_id in [p3.id, p4.id]:
-                    assert a.receiver_id not in [p3.id, p4.id]
+        assert set(counts) == valid
+        # Within 10% of an even split; a bias like favoring low indices is far outside this
+        assert all(900 <= count <= 1100 for count in counts.values()), counts.values()
+    
+    def test_multiple_clusters(self, two_families):
+        """Multiple clusters should all be respected."""
+        _assert_reaches_every_valid_circle(two_families)
 
 
 class TestAssignmentData:
@@ -191,107 +398,31 @@ class TestAssignmentData:
 class TestSeparateKidsMatching:
     """Tests for kids-only matching feature (when separate_kids=True)."""
     
-    def test_kids_match_only_with_kids(self):
+    def test_kids_match_only_with_kids(self, three_kids_three_adults):
         """Kids should only be matched with other kids when separate_kids=True."""
-        # 3 kids and 3 adults
-        kid1 = Participant(name="Kid1", email="kid1@test.com", is_kid=True)
-        kid2 = Participant(name="Kid2", email="kid2@test.com", is_kid=True)
-        kid3 = Participant(name="Kid3", email="kid3@test.com", is_kid=True)
-        adult1 = Participant(name="Adult1", email="adult1@test.com", is_kid=False)
-        adult2 = Participant(name="Adult2", email="adult2@test.com", is_kid=False)
-        adult3 = Participant(name="Adult3", email="adult3@test.com", is_kid=False)
-        
-        storage = MockStorage([kid1, kid2, kid3, adult1, adult2, adult3])
-        
-        # Run multiple times since it's random
-        for _ in range(50):
-            assignments = create_assignments(storage, separate_kids=True)
-            
-            kid_ids = {kid1.id, kid2.id, kid3.id}
-            adult_ids = {adult1.id, adult2.id, adult3.id}
-            
-            for a in assignments:
-                if a.giver_id in kid_ids:
-                    # Kid giver should have kid receiver
-                    assert a.receiver_id in kid_ids, f"Kid {a.giver_name} matched with adult!"
-                else:
-                    # Adult giver should have adult receiver
-                    assert a.receiver_id in adult_ids, f"Adult {a.giver_name} matched with kid!"
-    
-    def test_adults_match_only_with_adults(self):
+        _assert_reaches_every_valid_circle(three_kids_three_adults, separate_kids=True)
+    
+    def test_adults_match_only_with_adults(self, two_kids_two_adults):
         """Adults should only be matched with other adults when separate_kids=True."""
-        kid1 = Participant(name="Kid1", email="kid1@test.com", is_kid=True)
-        kid2 = Participant(name="Kid2", email="kid2@test.com", is_kid=True)
-        adult1 = Participant(name="Adult1", email="adult1@test.com", is_kid=False)
-        adult2 = Participant(name="Adult2", email="adult2@test.com", is_kid=False)
-        
-        storage = MockStorage([kid1, kid2, adult1, adult2])
-        
-        for _ in range(30):
-            assignments = create_assignments(storage, separate_kids=True)
-            
-            for a in assignments:
-                giver_is_kid = a.giver_id in {kid1.id, kid2.id}
-                receiver_is_kid = a.receiver_id in {kid1.id, kid2.id}
-                # They should match: both kids or both adults
-                assert giver_is_kid == receiver_is_kid
+        _assert_reaches_every_valid_circle(two_kids_two_adults, separate_kids=True)
     
-    def test_single_kid_fails_with_separate_kids(self):
+    def test_single_kid_fails_with_separate_kids(self, kids, adults):
         """Only 1 kid should raise an error when separate_kids=True."""
-        kid = Participant(name="LonelyKid", email="kid@test.com", is_kid=True)
-        adult1 = Participant(name="Adult1", email="adult1@test.com", is_kid=False)
-        adult2 = Participant(name="Adult2", email="adult2@test.com", is_kid=False)
-        
-        storage = MockStorage([kid, adult1, adult2])
+        storage = MockStorage([kids[0], *adults[:2]])
         
         with pytest.raises(MatcherError, match="Only 1 kid"):
             create_assignments(storage, separate_kids=True)
     
-    def test_two_kids_two_adults_separated(self):
+    def test_two_kids_two_adults_separated(self, two_kids_two_adults):
         """Minimum viable scenario with both groups separated."""
-        kid1 = Participant(name="Kid1", email="kid1@test.com", is_kid=True)
-        kid2 = Participant(name="Kid2", email="kid2@test.com", is_kid=True)
-        adult1 = Participant(name="Adult1", email="adult1@test.com", is_kid=False)
-        adult2 = Participant(name="Adult2", email="adult2@test.com", is_kid=False)
-        
-        storage = MockStorage([kid1, kid2, adult1, adult2])
-        
-        for _ in range(30):
-            assignments = create_assignments(storage, separate_kids=True)
-            
-            # Kids should match: kid1 -> kid2, kid2 -> kid1
-            # Adults should match: adult1 -> adult2, adult2 -> adult1
-            kid_ids = {kid1.id, kid2.id}
-            adult_ids = {adult1.id, adult2.id}
-            
-            for a in assignments:
-                if a.giver_id in kid_ids:
-                    assert a.receiver_id in kid_ids
-                    assert a.giver_id != a.receiver_id  # Not self
-                else:
-                    assert a.receiver_id in adult_ids
-                    assert a.giver_id != a.receiver_id
-    
-    def test_kids_with_cluster_exclusion(self):
+        # Kids should match: kid1 -> kid2, kid2 -> kid1
+        # Adults should match: adult1 -> adult2, adult2 -> adult1
+        assert len(_valid_circles(two_kids_two_adults, separate_kids=True)) == 1
+        _assert_reaches_every_valid_circle(two_kids_two_adults, separate_kids=True)
+    
+    def test_kids_with_cluster_exclusion(self, sibling_kids):
         """Kids in the same cluster should still not match when separate_kids=True."""
-        cluster = Cluster(name="Siblings")
-        
-        kid1 = Participant(name="Kid1", email="kid1@test.com", is_kid=True, cluster_id=cluster.id)
-        kid2 = Participant(name="Kid2", email="kid2@test.com", is_kid=True, cluster_id=cluster.id)
-        kid3 = Participant(name="Kid3", email="kid3@test.com", is_kid=True)
-        kid4 = Participant(name="Kid4", email="kid4@test.com", is_kid=True)
-        
-        cluster.member_ids = [kid1.id, kid2.id]
-        
-        storage = MockStorage([kid1, kid2, kid3, kid4], [cluster])
-        
-        for _ in range(50):
-            assignments = create_assignments(storage, separate_kids=True)
-            
-            for a in assignments:
-                # Siblings should never get each other
-                if a.giver_id in [kid1.id, kid2.id]:
-                    assert a.receiver_id not in [kid1.id, kid2.id]
+        _assert_reaches_every_valid_circle(sibling_kids, separate_kids=True)
     
     def test_kids_cluster_too_large_fails(self):
         """If kid cluster has more than half of kids, it should fail when separate_kids=True."""
@@ -334,10 +465,9 @@ class TestSeparateKidsMatching:
 class TestRandomMatching:
     """Tests for default random matching (separate_kids=False)."""
     
-    def test_default_allows_kid_adult_matching(self):
+    def test_default_allows_kid_adult_matching(self, kids, adults):
         """By default, kids can be matched with adults."""
-        kid1 = Participant(name="Kid1", email="kid1@test.com", is_kid=True)
-        adult1 = Participant(name="Adult1", email="adult1@test.com", is_kid=False)
+        kid1, adult1 = kids[0], adults[0]
         
         storage = MockStorage([kid1, adult1])
         
@@ -346,69 +476,42 @@ class TestRandomMatching:
         
         assert len(assignments) == 2
         # Verify one gives to other
-        givers = {a.giver_id for a in assignments}
-        receivers = {a.receiver_id for a in assignments}
-        assert givers == {kid1.id, adult1.id}
-        assert receivers == {kid1.id, adult1.id}
+        pair = {kid1.id, adult1.id}
+        givers, receivers = _givers_and_receivers(assignments)
+        assert givers == pair
+        assert receivers == pair
     
-    def test_single_kid_works_in_random_mode(self):
+    def test_single_kid_works_in_random_mode(self, kids, adults):
         """Single kid should work fine without separate_kids."""
-        kid = Participant(name="Kid1", email="kid@test.com", is_kid=True)
-        adult1 = Participant(name="Adult1", email="adult1@test.com", is_kid=False)
-        adult2 = Participant(name="Adult2", email="adult2@test.com", is_kid=False)
-        
-        storage = MockStorage([kid, adult1, adult2])
+        storage = MockStorage([kids[0], *adults[:2]])
         
         # Should work - no separation enforced
         assignments = create_assignments(storage)  # separate_kids=False by default
         
         assert len(assignments) == 3
     
-    def test_mixed_group_can_cross_match(self):
+    def test_mixed_group_can_cross_match(self, two_kids_two_adults):
         """Kids and adults can be matched with each other in random mode."""
-        kid1 = Participant(name="Kid1", email="kid1@test.com", is_kid=True)
-        kid2 = Participant(name="Kid2", email="kid2@test.com", is_kid=True)
-        adult1 = Participant(name="Adult1", email="adult1@test.com", is_kid=False)
-        adult2 = Participant(name="Adult2", email="adult2@test.com", is_kid=False)
+        kid_ids = _kid_ids(two_kids_two_adults)
         
-        storage = MockStorage([kid1, kid2, adult1, adult2])
-        
-        # Run many times and check that cross-matching CAN happen
-        cross_match_found = False
-        for _ in range(100):
-            assignments = create_assignments(storage)  # separate_kids=False by default
-            
-            for a in assignments:
-                giver_is_kid = a.giver_id in {kid1.id, kid2.id}
-                receiver_is_kid = a.receiver_id in {kid1.id, kid2.id}
-                if giver_is_kid != receiver_is_kid:
-                    cross_match_found = True
-                    break
-            if cross_match_found:
-                break
-        
-        assert cross_match_found, "Cross-matching should be possible in random mode"
-    
-    def test_all_kids_works_in_random_mode(self):
-        """All kids should still work in random mode."""
-        kids = [
-            Participant(name=f"Kid{i}", email=f"kid{i}@test.com", is_kid=True)
-            for i in range(4)
-        ]
+        # Seed 0 is known to cross-match; any seed that does would do
+        random.seed(0)
+        assignments = create_assignments(two_kids_two_adults)  # separate_kids=False by default
         
-        storage = MockStorage(kids)
+        assert any(
+            (a.giver_id in kid_ids) != (a.receiver_id in kid_ids) for a in assignments
+        ), "Cross-matching should be possible in random mode"
+    
+    def test_all_kids_works_in_random_mode(self, kids):
+        """All kids should still work in random mode."""
+        storage = MockStorage(list(kids))
         
         assignments = create_assignments(storage)
         assert len(assignments) == 4
     
-    def test_all_adults_works_in_random_mode(self):
+    def test_all_adults_works_in_random_mode(self, adults):
         """All adults should still work in random mode."""
-        adults = [
-            Participant(name=f"Adult{i}", email=f"adult{i}@test.com", is_kid=False)
-            for i in range(4)
-        ]
-        
-        storage = MockStorage(adults)
+        storage = MockStorage(list(adults))
         
         assignments = create_assignments(storage)
         assert len(assignments) == 4
@@ -426,13 +529,7 @@ class TestRandomMatching:
         
         storage = MockStorage([kid1, adult1, kid2, adult2], [cluster])
         
-        for _ in range(50):
-            assignments = create_assignments(storage)
-            
-            for a in assignments:
-                # Family members (kid1 and adult1) should not match each other
-                if a.giver_id in [kid1.id, adult1.id]:
-                    assert a.receiver_id not in [kid1.id, adult1.id]
+        _assert_reaches_every_valid_circle(storage)
 
 
 class TestVerificationCode:
@@ -440,8 +537,8 @@ class TestVerificationCode:
     
     def test_verification_code_is_deterministic(self):
         """Same giver/receiver pair should always produce the same code."""
-        giver_id = uuid4()
-        receiver_id = uuid4()
+        giver_id = UUID(int=1)
+        receiver_id = UUID(int=2)
         
         code1 = generate_verification_code(giver_id, receiver_id)
         code2 = generate_verification_code(giver_id, receiver_id)
@@ -450,8 +547,8 @@ class TestVerificationCode:
     
     def test_verification_code_is_4_characters(self):
         """Verification codes should be exactly 4 characters."""
-        giver_id = uuid4()
-        receiver_id = uuid4()
+        giver_id = UUID(int=1)
+        receiver_id = UUID(int=2)
         
         code = generate_verification_code(giver_id, receiver_id)
         
@@ -459,8 +556,8 @@ class TestVerificationCode:
     
     def test_verification_code_is_uppercase(self):
         """Verification codes should be uppercase."""
-        giver_id = uuid4()
-        receiver_id = uuid4()
+        giver_id = UUID(int=1)
+        receiver_id = UUID(int=2)
         
         code = generate_verification_code(giver_id, receiver_id)
         
@@ -468,7 +565,7 @@ class TestVerificationCode:
     
     def test_different_pairs_different_codes(self):
         """Different giver/receiver pairs should have different codes."""
-        id1, id2, id3 = uuid4(), uuid4(), uuid4()
+        id1, id2, id3 = UUID(int=1), UUID(int=2), UUID(int=3)
         
         code1 = generate_verification_code(id1, id2)
         code2 = generate_verification_code(id1, id3)
@@ -481,7 +578,7 @@ class TestVerificationCode:
     
     def test_order_matters(self):
         """Swapping giver and receiver should produce different codes."""
-        id1, id2 = uuid4(), uuid4()
+        id1, id2 = UUID(int=1), UUID(int=2)
         
         code1 = generate_verification_code(id1, id2)
         code2 = generate_verification_code(id2, id1)
@@ -508,17 +605,16 @@ class TestAssignmentHasVerificationCode:
     
     def test_verification_codes_are_unique_per_assignment(self):
         """Each assignment should have a unique verification code."""
-        participants = [
-            Participant(name=f"Person{i}", email=f"p{i}@test.com")
-            for i in range(10)
-        ]
-        storage = MockStorage(participants)
-        
-        assignments = create_assignments(storage)
-        codes = [a.verification_code for a in assignments]
-        
-        # All codes should be unique
-        assert len(codes) == len(set(codes)), "Some verification codes are duplicated"
+        # create_assignments takes its codes from generate_verification_code
+        # (see test_verification_code_matches_expected), so hash a gift
+        # circle's pairs directly instead of running the matcher. Fixed ids
+        # keep the 16-bit codes from colliding by chance.
+        ids = [UUID(int=i) for i in range(1, 11)]
+        seen = set()
+        for giver_id, receiver_id in zip(ids, ids[1:] + ids[:1]):
+            code = generate_verification_code(giver_id, receiver_id)
+            assert code not in seen, f"Verification code {code} is duplicated"
+            seen.add(code)
     
     def test_verification_code_matches_expected(self):
         """Verification code should match what generate_verification_code produces."""
@@ -537,109 +633,42 @@ class TestAssignmentHasVerificationCode:
 class TestClusterNoIntraMatching:
     """Explicit stress tests that cluster members NEVER match each other."""
     
-    def test_no_match_within_cluster_stress(self):
-        """Run 100 iterations to verify cluster exclusion never fails."""
-        cluster = Cluster(name="Family")
-        
-        # 4 family members, 4 non-family
-        family_members = [
-            Participant(name=f"Family{i}", email=f"fam{i}@test.com", cluster_id=cluster.id)
-            for i in range(4)
-        ]
-        others = [
-            Participant(name=f"Other{i}", email=f"other{i}@test.com")
-            for i in range(4)
-        ]
-        
-        cluster.member_ids = [p.id for p in family_members]
-        storage = MockStorage(family_members + others, [cluster])
-        
-        family_ids = {p.id for p in family_members}
-        
-        for iteration in range(100):
-            assignments = create_assignments(storage)
-            
-            for a in assignments:
-                if a.giver_id in family_ids:
-                    assert a.receiver_id not in family_ids, (
-                        f"Iteration {iteration}: Family member {a.giver_name} "
-                        f"was matched with family member (receiver_id in family cluster)"
-                    )
-    
-    def test_large_cluster_exclusion(self):
+    @pytest.mark.parametrize("seed", STRESS_SEEDS)
+    def test_no_match_within_cluster_stress(self, family_and_friends, seed):
+        """Run 100 seeds to verify cluster exclusion never fails."""
+        family_ids = set(family_and_friends.clusters[0].member_ids)
+        random.seed(seed)
+        
+        for a in create_assignments(family_and_friends):
+            if a.giver_id in family_ids:
+                assert a.receiver_id not in family_ids, (
+                    f"Seed {seed}: Family member {a.giver_name} "
+                    f"was matched with family member (receiver_id in family cluster)"
+                )
+    
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_large_cluster_exclusion(self, two_big_families, seed):
         """Test with larger clusters to ensure exclusion works at scale."""
-        cluster1 = Cluster(name="Big Family 1")
-        cluster2 = Cluster(name="Big Family 2")
-        
-        # 5 members in each cluster, 10 independent participants
-        family1 = [
-            Participant(name=f"Fam1_{i}", email=f"fam1_{i}@test.com", cluster_id=cluster1.id)
-            for i in range(5)
-        ]
-        family2 = [
-            Participant(name=f"Fam2_{i}", email=f"fam2_{i}@test.com", cluster_id=cluster2.id)
-            for i in range(5)
-        ]
-        independents = [
-            Participant(name=f"Ind_{i}", email=f"ind_{i}@test.com")
-            for i in range(10)
-        ]
-        
-        cluster1.member_ids = [p.id for p in family1]
-        cluster2.member_ids = [p.id for p in family2]
+        fam1_ids, fam2_ids = (set(c.member_ids) for c in two_big_families.clusters)
+        random.seed(seed)
         
-        all_participants = family1 + family2 + independents
-        storage = MockStorage(all_participants, [cluster1, cluster2])
-        
-        fam1_ids = {p.id for p in family1}
-        fam2_ids = {p.id for p in family2}
-        
-        for _ in range(50):
-            assignments = create_assignments(storage)
-            
-            for a in assignments:
-                if a.giver_id in fam1_ids:
-                    assert a.receiver_id not in fam1_ids, "Family 1 member matched with Family 1"
-                if a.giver_id in fam2_ids:
-                    assert a.receiver_id not in fam2_ids, "Family 2 member matched with Family 2"
+        for a in create_assignments(two_big_families):
+            if a.giver_id in fam1_ids:
+                assert a.receiver_id not in fam1_ids, "Family 1 member matched with Family 1"
+            if a.giver_id in fam2_ids:
+                assert a.receiver_id not in fam2_ids, "Family 2 member matched with Family 2"
     
-    def test_cluster_exclusion_with_kids_separated(self):
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_cluster_exclusion_with_kids_separated(self, mixed_family, seed):
         """Cluster exclusion should still work when kids are separated."""
-        cluster = Cluster(name="Family")
-        
-        # 2 kids in family, 2 adults in family, 2 kids outside, 2 adults outside
-        family_kids = [
-            Participant(name=f"FamKid{i}", email=f"famkid{i}@test.com", cluster_id=cluster.id, is_kid=True)
-            for i in range(2)
-        ]
-        family_adults = [
-            Participant(name=f"FamAdult{i}", email=f"famadult{i}@test.com", cluster_id=cluster.id, is_kid=False)
-            for i in range(2)
-        ]
-        other_kids = [
-            Participant(name=f"OtherKid{i}", email=f"otherkid{i}@test.com", is_kid=True)
-            for i in range(2)
-        ]
-        other_adults = [
-            Participant(name=f"OtherAdult{i}", email=f"otheradult{i}@test.com", is_kid=False)
-            for i in range(2)
-        ]
-        
-        cluster.member_ids = [p.id for p in family_kids + family_adults]
-        
-        all_participants = family_kids + family_adults + other_kids + other_adults
-        storage = MockStorage(all_participants, [cluster])
-        
-        family_ids = {p.id for p in family_kids + family_adults}
-        
-        for _ in range(50):
-            assignments = create_assignments(storage, separate_kids=True)
-            
-            for a in assignments:
-                if a.giver_id in family_ids:
-                    assert a.receiver_id not in family_ids, (
-                        f"Family member {a.giver_name} matched with family member"
-                    )
+        family_ids = set(mixed_family.clusters[0].member_ids)
+        random.seed(seed)
+        
+        for a in create_assignments(mixed_family, separate_kids=True):
+            if a.giver_id in family_ids:
+                assert a.receiver_id not in family_ids, (
+                    f"Family member {a.giver_name} matched with family member"
+                )
 
 
 class TestAssignmentKidFlag:
@@ -659,14 +688,9 @@ class TestAssignmentKidFlag:
             else:
                 assert a.is_kid is False
     
-    def test_adult_assignment_has_is_kid_false(self):
+    def test_adult_assignment_has_is_kid_false(self, adults):
         """Assignments for adults should have is_kid=False."""
-        adults = [
-            Participant(name=f"Adult{i}", email=f"adult{i}@test.com", is_kid=False)
-            for i in range(3)
-        ]
-        
-        storage = MockStorage(adults)
+        storage = MockStorage(list(adults[:3]))
         assignments = create_assignments(storage)
         
         for a in assignments:
@@ -0,0 +1,316 @@
+"""Tests for JSON file storage."""
+
+import pytest
+from uuid import UUID
+
+from secret_santa.models import Assignment, Participant
+from secret_santa.storage import Storage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Create a storage instance in a temporary directory."""
+    return Storage(data_dir=tmp_path / ".secret-santa")
+
+
+def make_assignment(i: int) -> Assignment:
+    """Build a simple assignment for giver number i."""
+    return Assignment(
+        giver_id=UUID(int=2 * i + 1),
+        receiver_id=UUID(int=2 * i + 2),
+        giver_name=f"Giver{i}",
+        receiver_name=f"Receiver{i}",
+        giver_email=f"giver{i}@test.com",
+        receiver_email=f"receiver{i}@test.com",
+    )
+
+
+class TestMarkEmailsSent:
+    """Tests for marking assignment emails as sent."""
+    
+    def test_marks_only_given_ids(self, storage):
+        """Only the listed givers should be marked as sent."""
+        assignments = [make_assignment(i) for i in range(3)]
+        storage.save_assignments(assignments)
+        
+        storage.mark_emails_sent([assignments[0].giver_id, assignments[2].giver_id])
+        
+        assert [a.email_sent for a in storage.get_assignments()] == [True, False, True]
+    
+    def test_marks_are_persisted(self, storage, tmp_path):
+        """Marked emails should survive reloading from disk."""
+        assignments = [make_assignment(i) for i in range(2)]
+        storage.save_assignments(assignments)
+        
+        storage.mark_emails_sent([assignments[1].giver_id])
+        
+        reloaded = Storage(data_dir=tmp_path / ".secret-santa")
+        assert [a.email_sent for a in reloaded.get_assignments()] == [False, True]
+    
+    def test_mark_after_reload(self, storage, tmp_path):
+        """Assignments loaded from disk should be found by giver."""
+        assignments = [make_assignment(i) for i in range(2)]
+        storage.save_assignments(assignments)
+        
+        reloaded = Storage(data_dir=tmp_path / ".secret-santa")
+        reloaded.mark_email_sent(assignments[0].giver_id)
+        
+        assert [a.email_sent for a in reloaded.get_assignments()] == [True, False]
+
+
+class TestTransaction:
+    """Tests for buffering writes with Storage.transaction()."""
+    
+    def test_writes_once_on_exit(self, storage, monkeypatch):
+        """Saves inside a transaction should be coalesced into one write."""
+        writes = []
+        original_write = storage._write
+        monkeypatch.setattr(storage, "_write", lambda: (writes.append(1), original_write()))
+        
+        with storage.transaction():
+            for i in range(5):
+                storage.add_participant(Participant(name=f"P{i}", email=f"p{i}@test.com"))
+            assert writes == []
+        
+        assert writes == [1]
+    
+    def test_changes_are_persisted(self, storage, tmp_path):
+        """Changes made in a transaction should be on disk afterwards."""
+        with storage.transaction():
+            storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+        
+        reloaded = Storage(data_dir=tmp_path / ".secret-santa")
+        assert [p.name for p in reloaded.list_participants()] == ["Alice"]
+    
+    def test_flushes_when_block_raises(self, storage, tmp_path):
+        """Changes made before an error should still be written."""
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+                raise RuntimeError("boom")
+        
+        reloaded = Storage(data_dir=tmp_path / ".secret-santa")
+        assert [p.name for p in reloaded.list_participants()] == ["Alice"]
+    
+    def test_nested_transactions_write_once(self, storage, monkeypatch):
+        """Only the outermost transaction should write."""
+        writes = []
+        original_write = storage._write
+        monkeypatch.setattr(storage, "_write", lambda: (writes.append(1), original_write()))
+        
+        with storage.transaction():
+            with storage.transaction():
+                storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+            assert writes == []
+            storage.add_participant(Participant(name="Bob", email="bob@test.com"))
+        
+        assert writes == [1]
+    
+    def test_flush_writes_buffered_changes(self, storage, tmp_path):
+        """flush() should put buffered changes on disk mid-transaction."""
+        with storage.transaction():
+            storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+            storage.flush()
+            
+            reloaded = Storage(data_dir=tmp_path / ".secret-santa")
+            assert [p.name for p in reloaded.list_participants()] == ["Alice"]
+
+
+class TestLoad:
+    """Tests for reading the data file back."""
+    
+    def test_fast_load_matches_full_validation(self, storage, tmp_path):
+        """Trusted loading should produce the same data as validating."""
+        from secret_santa.models import Cluster, SecretSantaData
+        
+        with storage.transaction():
+            storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+            storage.add_participant(Participant(name="Bob", email="bob@test.com", is_kid=True))
+            storage.create_cluster(Cluster(name="Family"))
+            storage.add_to_cluster("Family", "Alice")
+            storage.save_assignments([make_assignment(0)])
+        
+        reloaded = Storage(data_dir=tmp_path / ".secret-santa").load()
+        validated = SecretSantaData.model_validate_json(storage.data_file.read_bytes())
+        
+        assert reloaded.model_dump() == validated.model_dump()
+        assert reloaded.participants[0].id == storage.list_participants()[0].id
+    
+    def test_unexpected_shape_falls_back_to_validation(self, storage):
+        """Files missing IDs should still load through pydantic's defaults."""
+        storage.data_file.write_text('{"participants": [{"name": "Alice", "email": "alice@test.com"}]}')
+        
+        reloaded = Storage(data_dir=storage.data_dir)
+        
+        assert [p.name for p in reloaded.list_participants()] == ["Alice"]
+    
+    def test_app_written_file_takes_fast_path(self, storage, monkeypatch):
+        """Files Storage wrote itself should pass the shape check without validating."""
+        from secret_santa.models import SecretSantaData
+        
+        storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+        storage.save_assignments([make_assignment(0)])
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("fell back to full validation")
+        
+        monkeypatch.setattr(SecretSantaData, "model_validate_json", fail)
+        reloaded = Storage(data_dir=storage.data_dir)
+        
+        assert [p.name for p in reloaded.list_participants()] == ["Alice"]
+    
+    def test_missing_or_mistyped_fields_fall_back_to_validation(self, storage):
+        """Older or hand-edited records should be validated, not half-built."""
+        import json
+        
+        storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+        storage.save_assignments([make_assignment(0)])
+        data = json.loads(storage.data_file.read_text())
+        del data["assignments"][0]["verification_code"]
+        del data["config"]["template_id"]
+        data["participants"][0]["is_kid"] = "true"
+        storage.data_file.write_text(json.dumps(data))
+        
+        reloaded = Storage(data_dir=storage.data_dir)
+        
+        assert reloaded.get_assignments()[0].verification_code == ""
+        assert reloaded.get_config().template_id is None
+        assert reloaded.list_participants()[0].is_kid is True
+
+
+class TestParticipantLookup:
+    """Tests for looking participants up by ID."""
+    
+    def test_get_by_id_tracks_adds_and_removes(self, storage):
+        """The ID lookup should follow participants being added and removed."""
+        alice = storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+        bob = storage.add_participant(Participant(name="Bob", email="bob@test.com"))
+        
+        assert storage.get_participant_by_id(alice.id) is alice
+        assert storage.participants_by_id() == {alice.id: alice, bob.id: bob}
+        
+        storage.remove_participant("Alice")
+        
+        assert storage.get_participant_by_id(alice.id) is None
+        assert storage.participants_by_id() == {bob.id: bob}
+    
+    def test_get_by_id_after_reload(self, storage, tmp_path):
+        """Participants loaded from disk should be found by ID."""
+        alice = storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+        
+        reloaded = Storage(data_dir=tmp_path / ".secret-santa")
+        
+        assert reloaded.get_participant_by_id(alice.id).name == "Alice"
+    
+    def test_get_by_name_is_case_insensitive_and_tracks_changes(self, storage):
+        """The name lookup should follow adds and removes, ignoring case."""
+        storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+        
+        assert storage.get_participant_by_name("ALICE").name == "Alice"
+        
+        storage.remove_participant("alice")
+        
+        assert storage.get_participant_by_name("Alice") is None
+    
+    def test_duplicate_names_fall_back_to_the_next_match(self, storage):
+        """Removing one of two same-named participants should leave the other findable."""
+        storage.add_participant(Participant(name="Sam", email="sam1@test.com"))
+        second = storage.add_participant(Participant(name="sam", email="sam2@test.com"))
+        
+        storage.remove_participant("Sam")
+        
+        assert storage.get_participant_by_name("Sam") is second
+
+
+class TestConfigCache:
+    """Tests for caching the resolved config."""
+    
+    def test_config_is_built_once(self, storage, monkeypatch):
+        """Repeated get_config calls should not re-resolve the environment."""
+        first = storage.get_config()
+        monkeypatch.setenv("SENDER_NAME", "Changed")
+        
+        assert storage.get_config() is first
+    
+    def test_save_config_invalidates_cache(self, storage):
+        """Saving a config should be visible to the next get_config."""
+        config = storage.get_config().model_copy(update={"gift_limit": 50})
+        storage.save_config(config)
+        
+        assert storage.get_config().gift_limit == 50
+
+
+class TestClusterLookup:
+    """Tests for the cluster name index."""
+    
+    def test_get_by_name_tracks_create_and_remove(self, storage):
+        """Clusters should be found by name until they are removed."""
+        from secret_santa.models import Cluster
+        
+        cluster = storage.create_cluster(Cluster(name="Family"))
+        
+        assert storage.get_cluster_by_name("family") is cluster
+        with pytest.raises(ValueError, match="already exists"):
+            storage.create_cluster(Cluster(name="FAMILY"))
+        
+        assert storage.remove_cluster("Family") is True
+        assert storage.get_cluster_by_name("Family") is None
+
+
+class TestWrite:
+    """Tests for writing the data file."""
+    
+    def test_write_leaves_no_temp_file(self, storage):
+        """The temporary file should be renamed over data.json."""
+        storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+        
+        assert storage.data_file.exists()
+        assert list(storage.data_dir.iterdir()) == [storage.data_file]
+    
+    def test_unchanged_data_is_not_rewritten(self, storage, monkeypatch):
+        """Saving data identical to what's on disk should skip the write."""
+        import os
+        
+        storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+        replaced = []
+        original_replace = os.replace
+        monkeypatch.setattr(os, "replace", lambda *args: (replaced.append(args), original_replace(*args)))
+        
+        storage.save()
+        assert replaced == []
+        
+        storage.add_participant(Participant(name="Bob", email="bob@test.com"))
+        assert len(replaced) == 1
+
+
+class TestClusterMembership:
+    """Tests for keeping cluster member lists in step."""
+    
+    def test_moving_between_clusters(self, storage):
+        """Joining a new cluster should leave the old one."""
+        from secret_santa.models import Cluster
+        
+        alice = storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+        first = storage.create_cluster(Cluster(name="First"))
+        second = storage.create_cluster(Cluster(name="Second"))
+        
+        storage.add_to_cluster("First", "Alice")
+        storage.add_to_cluster("Second", "Alice")
+        
+        assert first.member_ids == []
+        assert second.member_ids == [alice.id]
+        with pytest.raises(ValueError, match="is not in cluster"):
+            storage.remove_from_cluster("First", "Alice")
+    
+    def test_membership_survives_reload(self, storage, tmp_path):
+        """Members loaded from disk should be removable."""
+        from secret_santa.models import Cluster
+        
+        storage.add_participant(Participant(name="Alice", email="alice@test.com"))
+        storage.create_cluster(Cluster(name="Family"))
+        storage.add_to_cluster("Family", "Alice")
+        
+        reloaded = Storage(data_dir=tmp_path / ".secret-santa")
+        reloaded.remove_participant("Alice")
+        
+        assert reloaded.get_cluster_by_name("Family").member_ids == []